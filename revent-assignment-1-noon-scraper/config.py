@@ -2,19 +2,113 @@
 Configuration settings for Noon Web Scraper
 """
 
+from typing import NamedTuple
+
 # Base URL
 BASE_URL = "https://www.noon.com/uae-en"
 SEARCH_URL = f"{BASE_URL}/search/?q="
 
+# User agents rotated per request by the HTTP clients
+# (desktop only: noon.com serves mobile agents a layout SELECTORS don't match)
+USER_AGENTS = [
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36 Edg/120.0.0.0',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36 Edg/122.0.0.0',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36 Edg/121.0.0.0',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36 OPR/107.0.0.0',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:121.0) Gecko/20100101 Firefox/121.0',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:123.0) Gecko/20100101 Firefox/123.0',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 14.3; rv:122.0) Gecko/20100101 Firefox/122.0',
+    'Mozilla/5.0 (X11; Ubuntu; Linux x86_64; rv:122.0) Gecko/20100101 Firefox/122.0',
+    'Mozilla/5.0 (X11; Linux x86_64; rv:121.0) Gecko/20100101 Firefox/121.0',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.2 Safari/605.1.15',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.3 Safari/605.1.15',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/16.6 Safari/605.1.15',
+]
+
+# User agents the browser rotates through: plain Chrome only, since Chrome
+# sends its own client hints (Sec-CH-UA) and they must match the agent
+BROWSER_USER_AGENTS = [ua for ua in USER_AGENTS if 'Chrome/' in ua and 'Edg/' not in ua and 'OPR/' not in ua]
+
+# Search page statuses that drop a keyword before any browser is started;
+# any other failure is left to the browser search
+MISSING_PAGE_STATUSES = (404, 410)
+
 # Timeout settings (in seconds)
 PAGE_LOAD_TIMEOUT = 30
 ELEMENT_WAIT_TIMEOUT = 10
+HTTP_TIMEOUT = 10  # Plain HTTP page requests (no browser)
+NETWORK_IDLE_TIMEOUT = 3  # Max wait for a product page's networkIdle lifecycle event
+
+# Keep-alive connection pool for plain HTTP product page requests
+HTTP_MAX_CONNECTIONS = 20  # Open connections kept per scraper
 SCROLL_PAUSE_TIME = 2
 
+# Chrome switches that turn off features the scraper never uses
+CHROME_LEAN_FLAGS = [
+    '--disable-gpu',
+    '--disable-extensions',
+    '--disable-background-networking',
+    '--disable-sync',
+    '--mute-audio',
+    '--disable-notifications',
+    '--disable-default-apps',
+    '--disable-features=Translate,BackForwardCache,AcceptCHFrame,MediaRouter,OptimizationHints',
+]
+
+# Subresources the browser never downloads: only DOM text is read, so
+# images, fonts and ad/analytics scripts are wasted bytes. Stylesheets are
+# kept, since the visibility and clickability waits around the sellers
+# modal depend on the production layout
+BLOCKED_URL_PATTERNS = [
+    '*.png', '*.jpg', '*.jpeg', '*.webp', '*.gif', '*.svg',
+    '*.woff', '*.woff2', '*.ttf',
+    '*googletagmanager*', '*google-analytics*', '*doubleclick*',
+]
+
 # Delays to avoid bot detection (in seconds)
 REQUEST_DELAY_MIN = 2
 REQUEST_DELAY_MAX = 4
-PRODUCT_DETAIL_DELAY = 1.5
+
+# Adaptive delay between product pages: shrinks after each normal page,
+# grows when noon.com shows signs of throttling, plus random jitter
+ADAPTIVE_DELAY = {
+    'min': 0.5,
+    'max': 6.0,
+    'start': 2.0,
+    'shrink': 0.9,
+    'grow': 1.8,
+    'jitter': 1.0,
+}
+
+# Page title fragments (lowercase) that indicate throttling or a block page
+THROTTLE_MARKERS = (
+    'access denied',
+    'too many requests',
+    'service unavailable',
+    'captcha',
+    'are you a robot',
+)
+
+# HTTP statuses that indicate throttling
+THROTTLE_STATUSES = (429, 503)
+
+# Parallel scraping: MAX_WORKERS browsers run at once, shared first between
+# keywords and then between each keyword's products
+MAX_WORKERS = 5
+WORKER_STARTUP_STAGGER = 0.1  # Seconds between worker start-ups
+PRODUCT_WORKERS = 4  # Max browsers per keyword (its search reuses one of them)
+
+# Search pages are fetched over HTTP/2 before any browser is started
+FAST_CONCURRENCY = 20  # Search pages fetched at the same time
 
 # CSS Selectors (using partial matching for dynamic class names)
 SELECTORS = {
@@ -29,10 +123,12 @@ SELECTORS = {
     'reviews_count': '[class*="reviews"], [class*="rating"]',
     'breadcrumbs': 'nav[class*="breadcrumb"] a, [class*="Breadcrumb"] a',
     'seller_name': '[class*="soldBy"], [class*="SoldBy"]',
-    'other_sellers_button': 'button:has-text("other seller")',
+    'other_sellers_button': '[data-qa*="other-sellers"], [data-qa*="otherSellers"], button[aria-label*="other seller" i]',
     'highlights': 'ul[class*="highlights"] li, div[class*="highlights"] li, [class*="description"]',
     
-    # Other sellers modal
+    # Other sellers modal (the other modal selectors are looked up inside sellers_modal,
+    # since modal_sellers also matches offer blocks on the product page itself)
+    'sellers_modal': '[role="dialog"], [aria-modal="true"], [class*="offersModal"], [class*="sellersModal"]',
     'modal_sellers': '[class*="offerCard"], [class*="sellerCard"], div[class*="offer"]',
     'modal_seller_name': '[class*="sellerName"], [class*="partner"] strong, strong',
     'modal_seller_price': '[class*="price"]',
@@ -40,9 +136,43 @@ SELECTORS = {
     'close_modal': 'button[class*="close"], [aria-label="Close"], button[class*="Close"]',
 }
 
+# JavaScript run once per product page to read every field, including the
+# primary seller and price, in a single WebDriver call. Takes SELECTORS as arguments[0]; fields whose
+# element is missing come back as null
+EXTRACT_JS = """
+const sel = arguments[0];
+const text = (el) => (el ? (el.innerText || '').trim() : null);
+const all = (key) => Array.from(document.querySelectorAll(sel[key]));
+return {
+    title: text(document.querySelector(sel.product_title)),
+    category: all('breadcrumbs').map(text).filter((t) => t && t.toLowerCase() !== 'home'),
+    description: all('highlights').slice(0, 3).map(text),
+    rating: text(document.querySelector(sel.rating_value)),
+    reviews: text(document.querySelector(sel.reviews_count)),
+    price: (document.querySelector(sel.price_now) || {}).textContent || null,
+    primarySeller: text(document.querySelector(sel.seller_name)),
+};
+"""
+
+# JavaScript returning every product link on a search results page in one
+# WebDriver call (fallback when no product cards are found)
+PRODUCT_LINKS_JS = """
+return Array.from(document.querySelectorAll('a[href*="/p/"]'))
+    .map((a) => a.href)
+    .filter((href) => href.includes('/uae-en/'));
+"""
+
+# Cache of scraped products, reused by later runs (disable with --no-cache)
+CACHE_FILE = ".noon_cache"
+CACHE_TTL = 24 * 60 * 60  # Seconds before a cached product is scraped again
+
 # Output settings
 OUTPUT_DIR = "output"
 OUTPUT_FILENAME_PREFIX = "noon_scraper"
+XLSXWRITER_MIN_ROWS = 5000  # Larger exports are written with xlsxwriter
+RAW_XML_MIN_ROWS = 50000  # Larger exports skip spreadsheet libraries entirely
+RAW_XML_BUFFER_SIZE = 1 << 20  # Bytes of sheet XML buffered per write
+NDJSON_BUFFER_SIZE = 1 << 20  # Bytes buffered by the NDJSON result stream
 
 # Excel column headers
 EXCEL_HEADERS = [
@@ -57,6 +187,33 @@ EXCEL_HEADERS = [
     "Product URL"
 ]
 
+
+class Product(NamedTuple):
+    """One scraped row: a product as offered by a single seller (a plain tuple ordered like EXCEL_HEADERS)"""
+    search_keyword: str = ''
+    category: str = ''
+    title: str = ''
+    description: str = ''
+    price: str = ''
+    rating: str = ''
+    reviews: str = ''
+    seller: str = ''
+    product_url: str = ''
+
+
+# Product attribute names, in the same order as EXCEL_HEADERS
+PRODUCT_FIELDS = Product._fields
+
+# JSON library for the NDJSON result stream: orjson when installed,
+# otherwise the standard library json module
+try:
+    import orjson as JSON_LIB
+except ImportError:
+    import json as JSON_LIB
+
 # Logging
 LOG_FILE = "scraper.log"
 LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+LOG_BUFFER_CAPACITY = 1024  # Records buffered before writing to LOG_FILE
+LOG_MAX_BYTES = 5 * 1024 * 1024  # Rotate LOG_FILE once it reaches this size
+LOG_BACKUP_COUNT = 3  # Rotated log files kept alongside LOG_FILE
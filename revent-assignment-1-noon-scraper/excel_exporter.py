@@ -3,12 +3,102 @@ Excel Exporter Module
 Handles creation and formatting of Excel output files
 """
 
-import pandas as pd
-from openpyxl import load_workbook
+from openpyxl import Workbook, load_workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, PatternFill, Alignment
+from openpyxl.utils import get_column_letter
+import xlsxwriter
 from datetime import datetime
+from xml.sax.saxutils import escape
 import os
-from config import OUTPUT_DIR, OUTPUT_FILENAME_PREFIX, EXCEL_HEADERS
+import re
+import zipfile
+from result_stream import read_ndjson
+from config import (
+    OUTPUT_DIR, OUTPUT_FILENAME_PREFIX, EXCEL_HEADERS,
+    XLSXWRITER_MIN_ROWS, RAW_XML_MIN_ROWS, RAW_XML_BUFFER_SIZE,
+)
+
+# Header styles, built once per process and shared by every export
+HEADER_FILL = PatternFill(start_color="0066CC", end_color="0066CC", fill_type="solid")
+HEADER_FONT = Font(bold=True, color="FFFFFF", size=11)
+HEADER_ALIGN = Alignment(horizontal='center', vertical='center')
+
+# Same header style expressed as xlsxwriter format properties
+HEADER_FORMAT = {
+    'bold': True,
+    'font_color': '#FFFFFF',
+    'font_size': 11,
+    'bg_color': '#0066CC',
+    'align': 'center',
+    'valign': 'vcenter',
+}
+
+# xlsxwriter workbook options: rows are flushed as they are written, and
+# cell text is stored as-is, skipping number, URL and formula detection
+XLSXWRITER_OPTIONS = {
+    'constant_memory': True,
+    'strings_to_numbers': False,
+    'strings_to_urls': False,
+    'strings_to_formulas': False,
+}
+
+# Static parts of a minimal XLSX package used by the raw XML writer
+_RAW_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '<Override PartName="/xl/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '</Types>'
+)
+_RAW_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+_RAW_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="Products" sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+_RAW_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>'
+    '<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>'
+    '</Relationships>'
+)
+# Style 1 is the header: bold white text on blue, centered
+_RAW_STYLES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<fonts count="2">'
+    '<font><sz val="11"/><name val="Calibri"/></font>'
+    '<font><b/><sz val="11"/><color rgb="FFFFFFFF"/><name val="Calibri"/></font>'
+    '</fonts>'
+    '<fills count="3">'
+    '<fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill>'
+    '<fill><patternFill patternType="solid"><fgColor rgb="FF0066CC"/><bgColor rgb="FF0066CC"/></patternFill></fill>'
+    '</fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="2">'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="0" fontId="1" fillId="2" borderId="0" xfId="0" applyFont="1" applyFill="1" applyAlignment="1">'
+    '<alignment horizontal="center" vertical="center"/></xf>'
+    '</cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>'
+)
+# Characters that are not allowed in XML 1.0 documents
+_ILLEGAL_XML_CHARS = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f]')
 
 
 class ExcelExporter:
@@ -24,8 +114,15 @@ class ExcelExporter:
         """
         Export scraped data to Excel file
         
+        Rows are streamed through an openpyxl write-only workbook with
+        formatting applied in the same pass, so the file is written once.
+        Exports of XLSXWRITER_MIN_ROWS rows or more use xlsxwriter in
+        constant-memory mode, which is faster for large files. From
+        RAW_XML_MIN_ROWS rows (or when the FAST_XLSX environment variable
+        is set) the sheet XML is generated directly.
+        
         Args:
-            data (list): List of dictionaries containing product data
+            data (list[Product]): Scraped product rows
             keyword (str): Optional keyword to include in filename
             
         Returns:
@@ -35,89 +132,283 @@ class ExcelExporter:
             print("No data to export!")
             return None
         
-        # Create DataFrame
-        df = pd.DataFrame(data, columns=EXCEL_HEADERS)
+        filepath = self._build_filepath(keyword)
         
-        # Generate filename with timestamp
-        timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-        keyword_part = f"_{keyword}" if keyword else ""
-        filename = f"{OUTPUT_FILENAME_PREFIX}{keyword_part}_{timestamp}.xlsx"
-        filepath = os.path.join(OUTPUT_DIR, filename)
+        rows, widths = self._prepare_rows(data)
+        self._write(filepath, rows, widths, len(rows))
+        
+        print(f"\nExcel file created: {filepath}")
+        print(f"Total rows: {len(data)}")
         
-        # Write to Excel
-        df.to_excel(filepath, index=False, sheet_name='Products')
+        return filepath
+    
+    def export_from_ndjson(self, ndjson_path, keyword=None):
+        """
+        Export records streamed to an NDJSON file
         
-        # Format the Excel file
-        self._format_excel(filepath)
+        The file is read twice, once to measure column widths and once to
+        write the rows, so memory use does not grow with the row count.
+        
+        Args:
+            ndjson_path (str): Path to the NDJSON file
+            keyword (str): Optional keyword to include in filename
+            
+        Returns:
+            str: Path to the created Excel file
+        """
+        widths = [len(h) for h in EXCEL_HEADERS]
+        count = 0
+        for record in read_ndjson(ndjson_path):
+            self._update_widths(widths, record)
+            count += 1
+        
+        if not count:
+            print("No data to export!")
+            return None
+        
+        filepath = self._build_filepath(keyword)
+        rows = read_ndjson(ndjson_path)
+        self._write(filepath, rows, widths, count)
         
         print(f"\nExcel file created: {filepath}")
-        print(f"Total rows: {len(df)}")
+        print(f"Total rows: {count}")
         
         return filepath
     
-    def _format_excel(self, filepath):
+    def _write(self, filepath, rows, widths, count):
         """
-        Apply formatting to Excel file
+        Write rows with the writer best suited to the row count
         
         Args:
             filepath (str): Path to Excel file
+            rows (iterable): Row tuples ordered like EXCEL_HEADERS
+            widths (list): Longest value length per column
+            count (int): Number of rows
         """
-        # Load workbook
-        wb = load_workbook(filepath)
-        ws = wb.active
-        
-        # Header formatting
-        header_fill = PatternFill(start_color="0066CC", end_color="0066CC", fill_type="solid")
-        header_font = Font(bold=True, color="FFFFFF", size=11)
+        if count >= RAW_XML_MIN_ROWS or os.environ.get('FAST_XLSX'):
+            self._write_raw_xml(filepath, rows, widths)
+        elif count >= XLSXWRITER_MIN_ROWS:
+            self._write_xlsxwriter(filepath, rows, widths)
+        else:
+            self._write_workbook(filepath, rows, widths)
+    
+    def _build_filepath(self, keyword=None):
+        """
+        Generate a timestamped output path
         
-        for cell in ws[1]:
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = Alignment(horizontal='center', vertical='center')
+        Args:
+            keyword (str): Optional keyword to include in filename
+            
+        Returns:
+            str: Path inside OUTPUT_DIR
+        """
+        timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        keyword_part = f"_{keyword}" if keyword else ""
+        filename = f"{OUTPUT_FILENAME_PREFIX}{keyword_part}_{timestamp}.xlsx"
+        return os.path.join(OUTPUT_DIR, filename)
+    
+    def _prepare_rows(self, data):
+        """
+        Collect product rows and measure column widths in one pass
         
-        # Auto-adjust column widths
-        for column in ws.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
+        Args:
+            data (iterable): Product rows
             
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
+        Returns:
+            tuple: (rows, widths) where widths holds the longest value per column
+        """
+        rows = []
+        widths = [len(h) for h in EXCEL_HEADERS]
+        
+        # Products are already tuples in EXCEL_HEADERS order
+        for row in data:
+            self._update_widths(widths, row)
+            rows.append(row)
+        
+        return rows, widths
+    
+    def _update_widths(self, widths, row):
+        """
+        Raise each column's width to fit the values of a row
+        
+        Args:
+            widths (list): Longest value length per column, updated in place
+            row (tuple): Row values ordered like EXCEL_HEADERS
+        """
+        for idx, value in enumerate(row):
+            length = len(str(value))
+            if length > widths[idx]:
+                widths[idx] = length
+    
+    def _new_workbook(self, widths):
+        """
+        Create a write-only workbook with the formatted header row
+        
+        Column widths and the frozen header must be set before the first
+        row is appended, so widths are measured by _prepare_rows up front.
+        
+        Args:
+            widths (list): Longest value length per column
             
-            # Set width with some padding
-            adjusted_width = min(max_length + 2, 50)  # Max width of 50
-            ws.column_dimensions[column_letter].width = adjusted_width
+        Returns:
+            tuple: (workbook, worksheet) ready for data rows
+        """
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet('Products')
         
         # Freeze header row
         ws.freeze_panes = 'A2'
         
-        # Save formatted workbook
+        # Auto-adjust column widths (with padding, max width of 50)
+        for idx, max_length in enumerate(widths):
+            ws.column_dimensions[get_column_letter(idx + 1)].width = min(max_length + 2, 50)
+        
+        header_cells = []
+        for header in EXCEL_HEADERS:
+            cell = WriteOnlyCell(ws, value=header)
+            cell.fill = HEADER_FILL
+            cell.font = HEADER_FONT
+            cell.alignment = HEADER_ALIGN
+            header_cells.append(cell)
+        ws.append(header_cells)
+        
+        return wb, ws
+    
+    def _write_workbook(self, filepath, rows, widths):
+        """
+        Write header and rows into a formatted write-only workbook
+        
+        Args:
+            filepath (str): Path to Excel file
+            rows (iterable): Row tuples ordered like EXCEL_HEADERS
+            widths (list): Longest value length per column
+        """
+        wb, ws = self._new_workbook(widths)
+        
+        for row in rows:
+            ws.append(row)
+        
         wb.save(filepath)
     
+    def _write_xlsxwriter(self, filepath, rows, widths):
+        """
+        Write header and rows with xlsxwriter in constant-memory mode
+        
+        Each row is flushed to disk as soon as the next one starts, so
+        memory use stays flat regardless of the number of rows. Values are
+        written as plain strings, so Product URL cells are not parsed as
+        hyperlinks and text starting with "=" is not turned into a formula.
+        
+        Args:
+            filepath (str): Path to Excel file
+            rows (iterable): Row tuples ordered like EXCEL_HEADERS
+            widths (list): Longest value length per column
+        """
+        wb = xlsxwriter.Workbook(filepath, XLSXWRITER_OPTIONS)
+        ws = wb.add_worksheet('Products')
+        
+        header_format = wb.add_format(HEADER_FORMAT)
+        
+        # Freeze header row and set widths (with padding, max width of 50)
+        ws.freeze_panes(1, 0)
+        for idx, max_length in enumerate(widths):
+            ws.set_column(idx, idx, min(max_length + 2, 50))
+        
+        ws.write_row(0, 0, EXCEL_HEADERS, header_format)
+        for row_idx, row in enumerate(rows, 1):
+            ws.write_row(row_idx, 0, row)
+        
+        wb.close()
+    
+    def _write_raw_xml(self, filepath, rows, widths):
+        """
+        Write the XLSX package by generating the sheet XML directly
+        
+        Bypasses any spreadsheet library: the static package parts come
+        from templates and rows are emitted as inline-string cells, with
+        output batched into RAW_XML_BUFFER_SIZE chunks. Compression level 1
+        favours speed over file size.
+        
+        Args:
+            filepath (str): Path to Excel file
+            rows (iterable): Row tuples ordered like EXCEL_HEADERS
+            widths (list): Longest value length per column
+        """
+        with zipfile.ZipFile(filepath, 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as zf:
+            zf.writestr('[Content_Types].xml', _RAW_CONTENT_TYPES)
+            zf.writestr('_rels/.rels', _RAW_ROOT_RELS)
+            zf.writestr('xl/workbook.xml', _RAW_WORKBOOK)
+            zf.writestr('xl/_rels/workbook.xml.rels', _RAW_WORKBOOK_RELS)
+            zf.writestr('xl/styles.xml', _RAW_STYLES)
+            
+            with zf.open('xl/worksheets/sheet1.xml', 'w') as sheet:
+                # Frozen header row and widths (with padding, max width of 50)
+                cols = ''.join(
+                    f'<col min="{idx}" max="{idx}" width="{min(max_length + 2, 50)}" customWidth="1"/>'
+                    for idx, max_length in enumerate(widths, 1)
+                )
+                buffer = [
+                    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+                    '<sheetViews><sheetView workbookViewId="0">'
+                    '<pane ySplit="1" topLeftCell="A2" activePane="bottomLeft" state="frozen"/>'
+                    '</sheetView></sheetViews>'
+                    f'<cols>{cols}</cols><sheetData>',
+                    self._raw_xml_row(EXCEL_HEADERS, style=1),
+                ]
+                size = 0
+                
+                for row in rows:
+                    chunk = self._raw_xml_row(row)
+                    buffer.append(chunk)
+                    size += len(chunk)
+                    if size >= RAW_XML_BUFFER_SIZE:
+                        sheet.write(''.join(buffer).encode('utf-8'))
+                        buffer = []
+                        size = 0
+                
+                buffer.append('</sheetData></worksheet>')
+                sheet.write(''.join(buffer).encode('utf-8'))
+    
+    def _raw_xml_row(self, values, style=None):
+        """
+        Render one row of cells for the raw XML writer
+        
+        Args:
+            values (iterable): Cell values
+            style (int): Optional cellXfs index applied to every cell
+            
+        Returns:
+            str: <row> element
+        """
+        style_attr = f' s="{style}"' if style is not None else ''
+        cells = []
+        for value in values:
+            if value is None or value == "":
+                cells.append('<c/>')
+            elif isinstance(value, (int, float)) and not isinstance(value, bool):
+                cells.append(f'<c{style_attr}><v>{value}</v></c>')
+            else:
+                text = escape(_ILLEGAL_XML_CHARS.sub('', str(value)))
+                cells.append(f'<c t="inlineStr"{style_attr}><is><t xml:space="preserve">{text}</t></is></c>')
+        return f'<row>{"".join(cells)}</row>'
+    
     def append_to_excel(self, filepath, new_data):
         """
         Append new data to existing Excel file
         
         Args:
             filepath (str): Path to existing Excel file
-            new_data (list): List of dictionaries to append
+            new_data (list[Product]): Product rows to append
         """
-        # Read existing data
-        df_existing = pd.read_excel(filepath)
-        
-        # Create DataFrame from new data
-        df_new = pd.DataFrame(new_data, columns=EXCEL_HEADERS)
-        
-        # Combine
-        df_combined = pd.concat([df_existing, df_new], ignore_index=True)
+        # Header styles, widths and frozen panes are already stored in the file,
+        # so only the new rows need to be added
+        wb = load_workbook(filepath)
+        ws = wb.active
         
-        # Write back
-        df_combined.to_excel(filepath, index=False, sheet_name='Products')
+        for row in new_data:
+            ws.append(row)
         
-        # Re-format
-        self._format_excel(filepath)
+        wb.save(filepath)
         
         print(f"Appended {len(new_data)} rows to {filepath}")
@@ -0,0 +1,104 @@
+"""
+Fast Search Module
+Fetches noon.com search pages over HTTP/2 without starting a browser
+"""
+
+import asyncio
+import random
+import logging
+from urllib.parse import quote, urljoin
+import httpx
+from lxml import html as lxml_html
+from config import (
+    SEARCH_URL, PAGE_LOAD_TIMEOUT, FAST_CONCURRENCY, USER_AGENTS, MISSING_PAGE_STATUSES,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def extract_product_urls(page_html, base_url=SEARCH_URL):
+    """
+    Extract product page URLs from search results HTML
+    
+    Args:
+        page_html (str): Search results page HTML
+        base_url (str): URL the page was fetched from, for relative links
+        
+    Returns:
+        list: Unique product URLs in page order
+    """
+    tree = lxml_html.fromstring(page_html)
+    product_urls = []
+    seen = set()
+    
+    for href in tree.xpath('//a[contains(@href, "/p/")]/@href'):
+        url = urljoin(base_url, href)
+        if '/uae-en/' in url and url not in seen:
+            seen.add(url)
+            product_urls.append(url)
+    
+    return product_urls
+
+
+async def _fetch_keyword(client, semaphore, keyword):
+    """
+    Fetch one search page and extract its product URLs
+    
+    Args:
+        client (httpx.AsyncClient): Shared HTTP client
+        semaphore (asyncio.Semaphore): Limits concurrent requests
+        keyword (str): Search keyword
+        
+    Returns:
+        list: Product URLs, an empty list if the page failed, or None if
+            the search page does not exist
+    """
+    url = f"{SEARCH_URL}{quote(keyword)}"
+    async with semaphore:
+        try:
+            response = await client.get(url, headers={'User-Agent': random.choice(USER_AGENTS)})
+        except httpx.HTTPError as e:
+            logger.warning(f"Fast search failed for '{keyword}': {str(e)}")
+            return []
+    
+    # Scripted clients are often refused (e.g. 403) where a browser is not,
+    # so only a definite "not found" drops the keyword
+    if response.status_code in MISSING_PAGE_STATUSES:
+        logger.warning(f"Search page for '{keyword}' returned HTTP {response.status_code}, skipping")
+        return None
+    if response.status_code != 200:
+        logger.info(f"Search page for '{keyword}' returned HTTP {response.status_code}, using the browser")
+        return []
+    
+    product_urls = extract_product_urls(response.text, str(response.url))
+    logger.info(f"Fast search found {len(product_urls)} products for '{keyword}'")
+    return product_urls
+
+
+async def _fetch_all(keywords):
+    """Fetch every keyword's search page concurrently"""
+    semaphore = asyncio.Semaphore(FAST_CONCURRENCY)
+    async with httpx.AsyncClient(http2=True, timeout=PAGE_LOAD_TIMEOUT, follow_redirects=True) as client:
+        results = await asyncio.gather(*[_fetch_keyword(client, semaphore, kw) for kw in keywords])
+    return dict(zip(keywords, results))
+
+
+def fetch_product_urls(keywords, max_products=None):
+    """
+    Collect product URLs for all keywords without a browser
+    
+    Search pages that fail, or that need JavaScript to list products,
+    come back empty so the caller can fall back to Selenium. Keywords
+    whose search page does not exist (MISSING_PAGE_STATUSES) map to None.
+    
+    Args:
+        keywords (list): Search keywords
+        max_products (int): Max URLs per keyword (None for all)
+        
+    Returns:
+        dict: Keyword -> list of product URLs, or None
+    """
+    results = asyncio.run(_fetch_all(keywords))
+    if max_products:
+        results = {kw: urls[:max_products] if urls else urls for kw, urls in results.items()}
+    return results
@@ -4,22 +4,25 @@ Author: Revent Automation Assignment
 Description: Scrapes product listings from noon.com with multi-seller support
 """
 
+import os
 import sys
-from noon_scraper import NoonScraper
+import time
+import argparse
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from noon_scraper import NoonScraper, setup_logging
 from excel_exporter import ExcelExporter
+from result_stream import NdjsonWriter
+from fast_search import fetch_product_urls
+from config import MAX_WORKERS, PRODUCT_WORKERS, WORKER_STARTUP_STAGGER, OUTPUT_DIR, OUTPUT_FILENAME_PREFIX
 import logging
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
+# Fixed console text, assembled once at import
+SEP = "=" * 60
 
-def print_banner():
-    """Print application banner"""
-    banner = """
+BANNER = """
     ╔══════════════════════════════════════════════════════════╗
     ║                                                          ║
     ║              NOON.COM WEB SCRAPER v1.0                   ║
@@ -28,8 +31,57 @@ def print_banner():
     ║  Exports to Excel format                                ║
     ║                                                          ║
     ╚══════════════════════════════════════════════════════════╝
+    
+"""
+
+HEADER_KEYWORDS = (
+    f"\n{SEP}\nKEYWORD INPUT\n{SEP}\n"
+    "\nEnter search keywords (one per line)\n"
+    "Press Enter twice when done, or type 'done' to finish\n\n"
+)
+HEADER_LIMIT = f"\n{SEP}\nPRODUCT LIMIT\n{SEP}\n"
+HEADER_SUMMARY = f"\n{SEP}\nSCRAPING SUMMARY\n{SEP}\n"
+HEADER_PROGRESS = (
+    f"\n{SEP}\nSCRAPING IN PROGRESS\n{SEP}\n\n"
+    "Please wait... This may take several minutes.\n\n"
+)
+HEADER_EXPORT = f"\n{SEP}\nEXPORTING TO EXCEL\n{SEP}\n\n"
+
+
+def parse_args(argv=None):
+    """
+    Parse command line arguments for non-interactive runs
+    
+    Args:
+        argv (list): Arguments to parse (defaults to sys.argv)
+        
+    Returns:
+        argparse.Namespace: Parsed arguments
     """
-    print(banner)
+    parser = argparse.ArgumentParser(description="Scrape product listings from noon.com")
+    parser.add_argument('--keywords', help="Comma-separated keywords; skips the interactive prompts")
+    parser.add_argument('--max', type=int, default=None, help="Max products per keyword (default: all)")
+    parser.add_argument('--workers', type=int, default=MAX_WORKERS, help=f"Browsers running at once, shared between keywords (default: {MAX_WORKERS})")
+    parser.add_argument('--yes', action='store_true', help="Start scraping without asking for confirmation")
+    parser.add_argument('--headless', action='store_true', help="Run browsers in headless mode")
+    parser.add_argument('--no-cache', action='store_true', help="Re-scrape every product, ignoring the product cache")
+    args = parser.parse_args(argv)
+    
+    if args.keywords is not None:
+        args.keywords = [kw.strip() for kw in args.keywords.split(',') if kw.strip()]
+        if not args.keywords:
+            parser.error("--keywords must contain at least one keyword")
+    if args.max is not None and args.max <= 0:
+        parser.error("--max must be a positive number")
+    if args.workers <= 0:
+        parser.error("--workers must be a positive number")
+    
+    return args
+
+
+def print_banner():
+    """Print application banner"""
+    sys.stdout.write(BANNER)
 
 
 def get_user_input():
@@ -39,11 +91,7 @@ def get_user_input():
     Returns:
         list: List of keywords
     """
-    print("\n" + "="*60)
-    print("KEYWORD INPUT")
-    print("="*60)
-    print("\nEnter search keywords (one per line)")
-    print("Press Enter twice when done, or type 'done' to finish\n")
+    sys.stdout.write(HEADER_KEYWORDS)
     
     keywords = []
     while True:
@@ -68,9 +116,7 @@ def get_max_products():
     Returns:
         int or None: Max products or None for all
     """
-    print("\n" + "="*60)
-    print("PRODUCT LIMIT")
-    print("="*60)
+    sys.stdout.write(HEADER_LIMIT)
     
     while True:
         response = input("\nLimit products per keyword? (Enter number or press Enter for all): ").strip()
@@ -88,29 +134,76 @@ def get_max_products():
             print("Invalid input! Please enter a number or press Enter.")
 
 
-def confirm_scrape(keywords, max_products):
+def get_max_workers():
+    """
+    Ask user how many browsers to run at once
+    
+    Returns:
+        int: Browser budget, shared between keywords (see split_workers)
+    """
+    while True:
+        response = input(f"\nParallel browsers? (Enter number or press Enter for {MAX_WORKERS}): ").strip()
+        
+        if response == '':
+            return MAX_WORKERS
+        
+        try:
+            workers = int(response)
+            if workers > 0:
+                return workers
+            else:
+                print("Please enter a positive number!")
+        except ValueError:
+            print("Invalid input! Please enter a number or press Enter.")
+
+
+def split_workers(workers, keyword_count):
+    """
+    Share the browser budget between keywords and their products
+    
+    Keywords get a worker each first; the rest of the budget goes to each
+    keyword's product workers (at most PRODUCT_WORKERS), so no more than
+    workers browsers ever run at once.
+    
+    Args:
+        workers (int): Browsers allowed to run at once
+        keyword_count (int): Number of keywords
+        
+    Returns:
+        tuple: (keywords scraped in parallel, browsers per keyword)
+    """
+    keyword_workers = min(workers, keyword_count)
+    return keyword_workers, max(1, min(PRODUCT_WORKERS, workers // keyword_workers))
+
+
+def confirm_scrape(keywords, max_products, workers=1):
     """
     Show summary and confirm before scraping
     
     Args:
         keywords (list): List of keywords
         max_products (int or None): Max products limit
+        workers (int): Browsers allowed to run at once
         
     Returns:
         bool: True if confirmed
     """
-    print("\n" + "="*60)
-    print("SCRAPING SUMMARY")
-    print("="*60)
-    print(f"\nKeywords to scrape: {len(keywords)}")
-    for idx, kw in enumerate(keywords, 1):
-        print(f"  {idx}. {kw}")
-    
     limit_text = f"{max_products} products" if max_products else "All products"
-    print(f"\nProducts per keyword: {limit_text}")
-    print(f"\nEstimated time: ~{len(keywords) * (max_products or 20) * 5} seconds")
+    keyword_workers, product_workers = split_workers(workers, len(keywords))
+    
+    # Ceiling divisions: rounds of keywords, then rounds of products per keyword
+    batches = -(-len(keywords) // keyword_workers)
+    product_rounds = -(-(max_products or 20) // product_workers)
     
-    print("\n" + "="*60)
+    # Build the whole summary and write it in one go
+    parts = [HEADER_SUMMARY, f"\nKeywords to scrape: {len(keywords)}\n"]
+    parts.extend(f"  {idx}. {kw}\n" for idx, kw in enumerate(keywords, 1))
+    parts.append(f"\nProducts per keyword: {limit_text}\n")
+    parts.append(f"Parallel browsers: {keyword_workers * product_workers} "
+                 f"({keyword_workers} keyword(s) x {product_workers} browser(s))\n")
+    parts.append(f"\nEstimated time: ~{batches * product_rounds * 5} seconds\n")
+    parts.append(f"\n{SEP}\n")
+    sys.stdout.write("".join(parts))
     
     while True:
         response = input("\nProceed with scraping? (yes/no): ").strip().lower()
@@ -122,64 +215,123 @@ def confirm_scrape(keywords, max_products):
             print("Please enter 'yes' or 'no'")
 
 
+def scrape_keyword(keyword, max_products, start_delay=0, headless=False, result_sink=None, product_urls=None,
+                   use_cache=True, product_workers=PRODUCT_WORKERS):
+    """
+    Scrape a single keyword with its own browsers
+    
+    Each worker gets its own NoonScraper (and WebDrivers), since a driver
+    must not be shared between threads.
+    
+    Args:
+        keyword (str): Search keyword
+        max_products (int or None): Max products limit
+        start_delay (float): Seconds to wait before starting the browser
+        headless (bool): Run the browser in headless mode
+        result_sink (callable): Optional callback receiving each scraped row
+        product_urls (list): Product URLs read from the keyword's search
+            page over HTTP; empty to search in the browser
+        use_cache (bool): Reuse products scraped by earlier runs
+        product_workers (int): Browsers the keyword may use at once
+        
+    Returns:
+        list: Scraped rows for the keyword
+    """
+    time.sleep(start_delay)
+    with NoonScraper(headless=headless, use_cache=use_cache, product_workers=product_workers) as scraper:
+        return scraper.scrape([keyword], max_products_per_keyword=max_products, result_sink=result_sink,
+                              product_urls={keyword: product_urls} if product_urls is not None else None)
+
+
 def main():
     """Main application flow"""
     
+    setup_logging()
+    args = parse_args()
+    ndjson_path = None
+    
     # Print banner
     print_banner()
     
     try:
-        # Get user input
-        keywords = get_user_input()
-        max_products = get_max_products()
+        # Get keywords from the command line, or fall back to the prompts
+        if args.keywords:
+            keywords = args.keywords
+            max_products = args.max
+            workers = args.workers
+        else:
+            keywords = get_user_input()
+            max_products = get_max_products()
+            workers = get_max_workers()
         
         # Confirm before proceeding
-        if not confirm_scrape(keywords, max_products):
+        if not args.yes and not confirm_scrape(keywords, max_products, workers):
             print("\nScraping cancelled by user")
             return
         
-        # Initialize scraper
-        print("\n" + "="*60)
-        print("INITIALIZING SCRAPER")
-        print("="*60 + "\n")
+        # Start scraping within the browser budget
+        sys.stdout.write(HEADER_PROGRESS)
         
-        scraper = NoonScraper(headless=False)  # Set to True for headless mode
+        # Use first keyword for filename if only one keyword
+        filename_keyword = keywords[0] if len(keywords) == 1 else None
+        
+        # Fetch every search page over HTTP/2 up front. Keywords whose page
+        # does not exist are dropped; those with no URLs (fetch refused or
+        # the page needs JavaScript) are searched in the browser
+        prefetched = fetch_product_urls(keywords, max_products)
+        keywords = [kw for kw in keywords if prefetched[kw] is not None]
+        if not keywords:
+            print("\nNo search results pages found for these keywords.")
+            return
+        
+        keyword_workers, product_workers = split_workers(workers, len(keywords))
         
-        # Start scraping
-        print("\n" + "="*60)
-        print("SCRAPING IN PROGRESS")
-        print("="*60 + "\n")
-        print("Please wait... This may take several minutes.\n")
+        # Stagger the first wave so the browsers don't all hit noon.com at once
+        start_delays = [idx * WORKER_STARTUP_STAGGER if idx < keyword_workers else 0
+                        for idx in range(len(keywords))]
         
-        data = scraper.scrape(keywords, max_products_per_keyword=max_products)
+        # Stream every row to disk as soon as it is scraped; the NDJSON file
+        # keeps partial results if the run crashes or is interrupted
+        os.makedirs(OUTPUT_DIR, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        ndjson_path = os.path.join(OUTPUT_DIR, f"{OUTPUT_FILENAME_PREFIX}_{timestamp}.ndjson")
+        
+        with NdjsonWriter(ndjson_path) as sink:
+            with ThreadPoolExecutor(max_workers=keyword_workers) as executor:
+                futures = [
+                    executor.submit(scrape_keyword, keyword, max_products, delay, args.headless, sink.write,
+                                    prefetched.get(keyword), not args.no_cache, product_workers)
+                    for keyword, delay in zip(keywords, start_delays)
+                ]
+                for future in as_completed(futures):
+                    future.result()
         
         # Check if data was scraped
-        if not data:
+        if not sink.records_written:
+            os.remove(ndjson_path)
             print("\nNo data was scraped. Please check the logs for errors.")
             return
         
-        # Export to Excel
-        print("\n" + "="*60)
-        print("EXPORTING TO EXCEL")
-        print("="*60 + "\n")
+        # Export to Excel, reading the streamed rows back lazily
+        sys.stdout.write(HEADER_EXPORT)
         
         exporter = ExcelExporter()
-        
-        # Use first keyword for filename if only one keyword
-        filename_keyword = keywords[0] if len(keywords) == 1 else None
-        filepath = exporter.export_to_excel(data, keyword=filename_keyword)
+        filepath = exporter.export_from_ndjson(ndjson_path, keyword=filename_keyword)
+        os.remove(ndjson_path)
         
         # Success message
-        print("\n" + "="*60)
-        print("SCRAPING COMPLETED SUCCESSFULLY!")
-        print("="*60)
-        print(f"\nTotal products scraped: {len(data)}")
-        print(f"Excel file saved: {filepath}")
-        print(f"\nTip: Open the Excel file to view all scraped data")
-        print("="*60 + "\n")
+        sys.stdout.write(
+            f"\n{SEP}\nSCRAPING COMPLETED SUCCESSFULLY!\n{SEP}\n"
+            f"\nTotal products scraped: {sink.records_written}\n"
+            f"Excel file saved: {filepath}\n"
+            f"\nTip: Open the Excel file to view all scraped data\n"
+            f"{SEP}\n\n"
+        )
         
     except KeyboardInterrupt:
         print("\n\nScraping interrupted by user (Ctrl+C)")
+        if ndjson_path and os.path.exists(ndjson_path):
+            print(f"Rows scraped so far are kept in: {ndjson_path}")
         sys.exit(1)
     
     except Exception as e:
@@ -3,54 +3,379 @@ Noon Web Scraper Module
 Handles scraping of product data from noon.com
 """
 
+import selenium
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.keys import Keys
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException
-from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
+import re
+from lxml import html as lxml_html
+import httpx
+import os
+import subprocess
 import time
 import random
+import queue
+import threading
+import functools
+import contextlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import logging
+import logging.handlers
 from tqdm import tqdm
 from config import *
+from fast_search import fetch_product_urls
+from product_cache import get_shared_cache
+
+# Logging is configured lazily by setup_logging() so that importing this
+# module never touches the filesystem or installs duplicate handlers
+_LOGGING_READY = False
+_LOGGING_LOCK = threading.Lock()
+
+
+def setup_logging():
+    """
+    Configure console and file logging once per process
+    
+    File records are buffered and written in batches of LOG_BUFFER_CAPACITY,
+    or immediately on ERROR; logging.shutdown() flushes the rest at exit.
+    LOG_FILE is only created when the first batch is written and is rotated
+    once it reaches LOG_MAX_BYTES.
+    """
+    global _LOGGING_READY
+    with _LOGGING_LOCK:
+        if _LOGGING_READY:
+            return
+        file_handler = logging.handlers.RotatingFileHandler(
+            LOG_FILE, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, delay=True
+        )
+        file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        logging.basicConfig(
+            level=logging.INFO,
+            format=LOG_FORMAT,
+            handlers=[
+                logging.handlers.MemoryHandler(LOG_BUFFER_CAPACITY, flushLevel=logging.ERROR, target=file_handler),
+                logging.StreamHandler()
+            ]
+        )
+        _LOGGING_READY = True
+
 
-# Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format=LOG_FORMAT,
-    handlers=[
-        logging.FileHandler(LOG_FILE),
-        logging.StreamHandler()
-    ]
-)
 logger = logging.getLogger(__name__)
 
 
+# Installed Selenium version as (major, minor)
+SELENIUM_VERSION = tuple(int(part) for part in selenium.__version__.split('.')[:2] if part.isdigit())
+
+# Marker set on the current page before a CDP navigation; the new document
+# starts without it, so its presence means the old page is still showing
+_NAV_MARKER_JS = "window.__noonScraperOldPage = true;"
+_NAV_READY_JS = "return !window.__noonScraperOldPage && document.readyState !== 'loading';"
+
+
+@functools.lru_cache(maxsize=1)
+def _resolve_driver_path():
+    """
+    Resolve the chromedriver binary once per process
+    
+    Selenium 4.12+ finds a matching driver itself (Selenium Manager), so
+    webdriver-manager and its network lookup are only used on older versions.
+    
+    Returns:
+        str: Path to chromedriver, or None to let Selenium Manager resolve it
+    """
+    if SELENIUM_VERSION >= (4, 12):
+        return None
+    
+    from webdriver_manager.chrome import ChromeDriverManager
+    return ChromeDriverManager().install()
+
+
+# Anything outside printable ASCII, stripped from scraped prices
+_NON_PRINTABLE = re.compile(r'[^\x20-\x7E]')
+
+# Last-resort lookup of the "other sellers" button by its (case-folded) text
+_OTHER_SELLERS_XPATH = (
+    By.XPATH,
+    "//button[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'other seller')]"
+)
+
+# Next.js page state embedded in product pages
+_NEXT_DATA_RE = re.compile(r'<script id="__NEXT_DATA__"[^>]*>(.*?)</script>', re.S)
+
+# Product keys that may hold the page's own total offer count
+_NEXT_DATA_OFFER_COUNT_KEYS = ('total_offers', 'offers_count', 'offer_count')
+
+
+# Client hint platform names for the OS tokens of BROWSER_USER_AGENTS
+_UA_PLATFORMS = (('Windows', 'Windows'), ('Macintosh', 'macOS'), ('Linux', 'Linux'))
+_CHROME_MAJOR_RE = re.compile(r'Chrome/(\d+)\.')
+
+
+def _user_agent_override(user_agent):
+    """
+    Build Network.setUserAgentOverride params for a Chrome user agent
+    
+    Without userAgentMetadata Chrome keeps sending its real client hints,
+    which then contradict the overridden User-Agent header.
+    
+    Args:
+        user_agent (str): Chrome user agent string
+        
+    Returns:
+        dict: CDP command parameters
+    """
+    major = _CHROME_MAJOR_RE.search(user_agent).group(1)
+    platform = next(name for token, name in _UA_PLATFORMS if token in user_agent)
+    return {
+        'userAgent': user_agent,
+        'userAgentMetadata': {
+            'brands': [
+                {'brand': 'Not_A Brand', 'version': '8'},
+                {'brand': 'Chromium', 'version': major},
+                {'brand': 'Google Chrome', 'version': major},
+            ],
+            'platform': platform,
+            'platformVersion': '',
+            'architecture': 'x86',
+            'model': '',
+            'mobile': False,
+        },
+    }
+
+
+# User agent overrides built once, one per browser user agent
+UA_OVERRIDES = [_user_agent_override(user_agent) for user_agent in BROWSER_USER_AGENTS]
+
+
+# Selenium locators built once from SELECTORS, reused for every lookup
+LOCATORS = {key: (By.CSS_SELECTOR, selector) for key, selector in SELECTORS.items()}
+
+# Presence and visibility conditions for each locator; they hold no
+# state between waits, so one instance serves every call
+PRESENCE = {key: EC.presence_of_element_located(locator) for key, locator in LOCATORS.items()}
+VISIBLE = {key: EC.visibility_of_element_located(locator) for key, locator in LOCATORS.items()}
+
+
+def _first(value):
+    """Return the first item of a JSON-LD value that may be a list"""
+    if isinstance(value, list):
+        return value[0] if value else None
+    return value
+
+
+def _types(item):
+    """Return the @type values of a JSON-LD item as a list"""
+    kinds = item.get('@type')
+    return kinds if isinstance(kinds, list) else [kinds]
+
+
+def parse_product_json_ld(page_html):
+    """
+    Extract product fields from the JSON-LD blocks of a product page
+    
+    Args:
+        page_html (str): Product page HTML
+        
+    Returns:
+        dict: title, category, description, rating, reviews, sellers (one
+            per listed offer) and offer_count (None when the data may not
+            list every offer), or None if the page has no Product JSON-LD
+    """
+    tree = lxml_html.fromstring(page_html)
+    product = None
+    breadcrumbs = []
+    
+    for block in tree.xpath("//script[@type='application/ld+json']/text()"):
+        try:
+            data = JSON_LIB.loads(str(block))
+        except ValueError:
+            continue
+        
+        items = data if isinstance(data, list) else data.get('@graph', [data]) if isinstance(data, dict) else []
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            kinds = _types(item)
+            if 'Product' in kinds and product is None:
+                product = item
+            elif 'BreadcrumbList' in kinds:
+                for element in item.get('itemListElement') or []:
+                    if isinstance(element, dict):
+                        name = element.get('name') or (_first(element.get('item')) or {}).get('name')
+                        if name and name.strip().lower() != 'home':
+                            breadcrumbs.append(name.strip())
+    
+    if not product or not product.get('name'):
+        return None
+    
+    offers = product.get('offers') or {}
+    if isinstance(offers, list):
+        # A list of several offers names every seller; a single listed
+        # offer may hide other sellers just like a bare Offer
+        offer_list = offers
+        offer_count = len(offers) if len(offers) > 1 else None
+    elif 'AggregateOffer' in _types(offers) and offers.get('offers'):
+        offer_list = offers['offers'] if isinstance(offers['offers'], list) else [offers['offers']]
+        try:
+            offer_count = int(offers['offerCount'])
+        except (KeyError, TypeError, ValueError):
+            offer_count = None
+    else:
+        # A single Offer, or an AggregateOffer without its offers, may hide
+        # other sellers, so the count is unknown
+        offer_list, offer_count = [offers], None
+    
+    sellers = []
+    seen = set()
+    for offer in offer_list:
+        if not isinstance(offer, dict):
+            continue
+        name = (_first(offer.get('seller')) or {}).get('name') or 'noon'
+        if name in seen:
+            continue
+        seen.add(name)
+        price = offer.get('price') or offer.get('lowPrice')
+        sellers.append({
+            'name': name,
+            'price': f"{offer.get('priceCurrency', 'AED')} {price}" if price else "N/A",
+            'rating': 'N/A',
+        })
+    if not sellers:
+        sellers.append({'name': 'noon', 'price': "N/A", 'rating': 'N/A'})
+        offer_count = None
+    
+    rating = product.get('aggregateRating') or {}
+    reviews = rating.get('reviewCount') or rating.get('ratingCount')
+    category = ' > '.join(breadcrumbs) or product.get('category') or "N/A"
+    
+    return {
+        'title': product['name'].strip(),
+        'category': category,
+        'description': (product.get('description') or "").strip() or "N/A",
+        'rating': str(rating['ratingValue']) if rating.get('ratingValue') else "N/A",
+        'reviews': str(reviews) if reviews else "N/A",
+        'sellers': sellers,
+        'offer_count': offer_count,
+    }
+
+
+def parse_product_next_data(page_html):
+    """
+    Extract product fields from the page's embedded Next.js state
+    
+    The __NEXT_DATA__ blob usually lists every offer, so unlike JSON-LD it
+    covers the other sellers too. Its shape is not a public contract, so
+    anything unexpected is treated as missing, and offer_count comes from
+    the blob's own total rather than the offers found: without that total
+    it is None and the sellers modal is still checked.
+    
+    Args:
+        page_html (str): Product page HTML
+        
+    Returns:
+        dict: Same keys as parse_product_json_ld, or None if the blob is
+            missing or has no usable product
+    """
+    match = _NEXT_DATA_RE.search(page_html)
+    if not match:
+        return None
+    
+    try:
+        data = JSON_LIB.loads(match.group(1))
+        page_props = data['props']['pageProps']
+        catalog = page_props.get('catalog') or page_props
+        product = catalog['product']
+        title = product['product_title'].strip()
+        
+        sellers = []
+        seen = set()
+        for variant in product.get('variants') or []:
+            for offer in variant.get('offers') or []:
+                name = offer.get('store_name') or 'noon'
+                if name in seen:
+                    continue
+                seen.add(name)
+                price = offer.get('sale_price') or offer.get('price')
+                sellers.append({'name': name, 'price': f"AED {price}" if price else "N/A", 'rating': 'N/A'})
+        
+        rating = product.get('product_rating') or {}
+        breadcrumbs = [crumb['name'].strip() for crumb in product.get('breadcrumbs') or []
+                       if crumb.get('name') and crumb['name'].strip().lower() != 'home']
+        bullets = [bullet.strip() for bullet in product.get('feature_bullets') or []][:3]
+        offer_count = next((int(product[key]) for key in _NEXT_DATA_OFFER_COUNT_KEYS
+                            if product.get(key) is not None), None)
+    except (ValueError, KeyError, TypeError, AttributeError):
+        return None
+    
+    if not title or not sellers:
+        return None
+    
+    return {
+        'title': title,
+        'category': ' > '.join(breadcrumbs) or "N/A",
+        'description': ' | '.join(bullets) or "N/A",
+        'rating': str(rating['value']) if rating.get('value') else "N/A",
+        'reviews': str(rating['count']) if rating.get('count') else "N/A",
+        'sellers': sellers,
+        'offer_count': offer_count,
+    }
+
+
 class NoonScraper:
     """Main scraper class for noon.com"""
     
-    def __init__(self, headless=False):
+    def __init__(self, headless=False, use_cache=True, product_workers=PRODUCT_WORKERS):
         """
         Initialize the scraper
         
         Args:
             headless (bool): Run browser in headless mode
+            use_cache (bool): Reuse products scraped within CACHE_TTL
+            product_workers (int): Products scraped in parallel; this is
+                also the most browsers the scraper runs, search included
         """
+        setup_logging()
         self.headless = headless
-        self.driver = None
+        self.product_workers = product_workers
+        self.cache = get_shared_cache() if use_cache else None
+        self._local = threading.local()
+        self._drivers = []
+        self._drivers_lock = threading.Lock()
+        self._driver_headless = None
+        self._waits = {}
+        self.http = None
         self.scraped_data = []
+        self.rows_scraped = 0
+        self._data_lock = threading.Lock()
+        self.result_sink = None
+        self.current_delay = ADAPTIVE_DELAY['start']
+        self._delay_lock = threading.Lock()
+        self._next_page_at = 0.0
+        self._driver_pool = self._new_driver_pool()
+    
+    @property
+    def driver(self):
+        """WebDriver used by the current thread (each product worker has its own)"""
+        return getattr(self._local, 'driver', None)
+    
+    @driver.setter
+    def driver(self, value):
+        self._local.driver = value
         
     def _init_driver(self):
         """Initialize Selenium WebDriver"""
         logger.info("Initializing Chrome WebDriver...")
         
         chrome_options = Options()
+        # Return from get() at DOMContentLoaded instead of waiting for every subresource
+        chrome_options.page_load_strategy = 'eager'
         if self.headless:
-            chrome_options.add_argument('--headless')
+            chrome_options.add_argument('--headless=new')
         
         # Additional options to avoid detection
         chrome_options.add_argument('--disable-blink-features=AutomationControlled')
@@ -60,78 +385,325 @@ class NoonScraper:
         chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
         chrome_options.add_experimental_option('useAutomationExtension', False)
         
+        # Trim Chrome's background work and process tree, and never load images
+        for flag in CHROME_LEAN_FLAGS:
+            chrome_options.add_argument(flag)
+        chrome_options.add_argument('--blink-settings=imagesEnabled=false')
+        chrome_options.add_experimental_option('prefs', {'profile.managed_default_content_settings.images': 2})
+        
+        # Record Page domain events only, so lifecycle events can be read back
+        chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+        chrome_options.add_experimental_option('perfLoggingPrefs', {'enableNetwork': False, 'enablePage': True})
+        
         # User agent
-        chrome_options.add_argument('user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
+        chrome_options.add_argument(f'user-agent={random.choice(BROWSER_USER_AGENTS)}')
         
-        service = Service(ChromeDriverManager().install())
+        # Silence chromedriver: its log output is never read
+        if SELENIUM_VERSION >= (4, 11):
+            service = Service(_resolve_driver_path(), service_args=['--log-level=OFF'],
+                              log_output=subprocess.DEVNULL)
+        else:
+            service = Service(_resolve_driver_path(), service_args=['--log-level=OFF'],
+                              log_path=os.devnull)
         self.driver = webdriver.Chrome(service=service, options=chrome_options)
         self.driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)
+        self._driver_headless = self.headless
+        with self._drivers_lock:
+            self._drivers.append(self.driver)
+        
+        # Drop images, fonts and trackers before they are requested
+        try:
+            self.driver.execute_cdp_cmd('Network.enable', {})
+            self.driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URL_PATTERNS})
+        except Exception as e:
+            logger.debug(f"Could not block subresources: {str(e)}")
+        
+        # Report networkIdle so product pages need not be scrolled and slept on
+        try:
+            self.driver.execute_cdp_cmd('Page.enable', {})
+            self.driver.execute_cdp_cmd('Page.setLifecycleEventsEnabled', {'enabled': True})
+        except Exception as e:
+            logger.debug(f"Could not enable lifecycle events: {str(e)}")
         
         logger.info("WebDriver initialized successfully")
     
+    def _ensure_driver(self):
+        """
+        Start the browser on first use and keep it for later scrape() calls
+        
+        A running browser is only replaced if the headless setting changed.
+        """
+        if self.driver is not None and self._driver_headless != self.headless:
+            with self._drivers_lock:
+                self._drivers.remove(self.driver)
+            self._waits = {key: wait for key, wait in self._waits.items() if key[0] is not self.driver}
+            self.driver.quit()
+            self.driver = None
+        if self.driver is None:
+            self._init_driver()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+    
+    def close(self):
+        """Quit every browser and close the HTTP session, if they were started"""
+        with self._drivers_lock:
+            drivers, self._drivers = self._drivers, []
+        self._waits.clear()
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception as e:
+                logger.debug(f"Error closing browser: {str(e)}")
+        if drivers:
+            logger.info(f"Closed {len(drivers)} browser(s)")
+        self.driver = None
+        self._driver_pool = self._new_driver_pool()
+        if self.http:
+            self.http.close()
+            self.http = None
+    
+    def _new_driver_pool(self):
+        """
+        Return a pool of product_workers browser slots
+        
+        Slots start empty (None); a slot's browser is only started when a
+        page borrowed with it actually needs one, and is then kept for the
+        next borrower.
+        """
+        pool = queue.Queue()
+        for _ in range(self.product_workers):
+            pool.put(None)
+        return pool
+    
+    @contextlib.contextmanager
+    def _pooled_driver(self):
+        """Lend the current thread a browser slot from the pool"""
+        self.driver = self._driver_pool.get()
+        try:
+            yield
+        finally:
+            self._driver_pool.put(self.driver)
+            self.driver = None
+    
+    def _load(self, url):
+        """
+        Open a URL with a freshly picked user agent
+        
+        Args:
+            url (str): Page URL
+        """
+        self._ensure_driver()
+        try:
+            self.driver.execute_cdp_cmd('Network.setUserAgentOverride', random.choice(UA_OVERRIDES))
+        except Exception as e:
+            logger.debug(f"Could not rotate user agent: {str(e)}")
+        self._navigate(url)
+    
+    def _navigate(self, url):
+        """
+        Navigate with CDP Page.navigate and return once the DOM is usable
+        
+        Unlike driver.get, this returns as soon as the new document is
+        interactive, or right away when Page.navigate reports no new
+        loader (a same-document navigation). Falls back to driver.get if
+        CDP is unavailable.
+        
+        Args:
+            url (str): Page URL
+        """
+        self._local.loader_id = None
+        try:
+            # Drop the previous page's lifecycle events so they can't be
+            # mistaken for this navigation's
+            self.driver.get_log('performance')
+        except Exception as e:
+            logger.debug(f"Could not clear the performance log: {str(e)}")
+        try:
+            self.driver.execute_script(_NAV_MARKER_JS)
+            result = self.driver.execute_cdp_cmd('Page.navigate', {'url': url})
+        except Exception as e:
+            logger.debug(f"CDP navigation unavailable, using driver.get: {str(e)}")
+            self.driver.get(url)
+            return
+        self._local.loader_id = result.get('loaderId')
+        if result.get('errorText'):
+            logger.debug(f"Navigation to {url} failed: {result['errorText']}")
+            return
+        if self._local.loader_id is None:
+            # Same-document navigation: no new document will replace the
+            # marked one, so there is nothing to wait for
+            return
+        
+        self._wait(PAGE_LOAD_TIMEOUT).until(lambda driver: driver.execute_script(_NAV_READY_JS))
+    
+    def _wait_for_network_idle(self, timeout=NETWORK_IDLE_TIMEOUT):
+        """
+        Wait for the networkIdle lifecycle event of the last navigation
+        
+        Lazy-loaded content has settled once it fires, so there is no need to
+        scroll the page and sleep. Only the event of the navigation's own
+        loader counts; without a loader id (driver.get fallback) this waits
+        for document.readyState to be complete instead. Gives up quietly
+        after timeout.
+        
+        Args:
+            timeout (float): Maximum seconds to wait
+            
+        Returns:
+            bool: True if networkIdle (or the complete readyState) was seen
+        """
+        loader_id = getattr(self._local, 'loader_id', None)
+        if loader_id is None:
+            try:
+                self._wait(timeout).until(
+                    lambda driver: driver.execute_script("return document.readyState === 'complete';"))
+                return True
+            except TimeoutException:
+                return False
+        
+        deadline = time.monotonic() + timeout
+        try:
+            while time.monotonic() < deadline:
+                # Reading the log also clears it, so stale events never pile up
+                for entry in self.driver.get_log('performance'):
+                    if '"networkIdle"' not in entry['message']:
+                        continue
+                    params = JSON_LIB.loads(entry['message'])['message']['params']
+                    if params.get('loaderId') == loader_id:
+                        return True
+                time.sleep(0.1)
+        except Exception as e:
+            logger.debug(f"Lifecycle events unavailable: {str(e)}")
+        return False
+    
     def _random_delay(self, min_delay=REQUEST_DELAY_MIN, max_delay=REQUEST_DELAY_MAX):
         """Add random delay to mimic human behavior"""
         delay = random.uniform(min_delay, max_delay)
         time.sleep(delay)
     
-    def _safe_find_element(self, by, selector, timeout=ELEMENT_WAIT_TIMEOUT, parent=None):
+    def _adaptive_delay(self):
+        """
+        Wait for the next product page slot
+        
+        Product workers share one schedule, so consecutive products are
+        spaced by the current adaptive delay plus random jitter across all
+        workers, not per worker.
+        """
+        with self._delay_lock:
+            now = time.monotonic()
+            start = max(now, self._next_page_at)
+            self._next_page_at = start + self.current_delay + random.uniform(0, ADAPTIVE_DELAY['jitter'])
+        time.sleep(start - now)
+    
+    def _record_response(self, throttled):
+        """
+        Adjust the adaptive delay after a page load
+        
+        Args:
+            throttled (bool): Whether the page looked like throttling
+        """
+        with self._delay_lock:
+            if throttled:
+                self.current_delay = min(ADAPTIVE_DELAY['max'], self.current_delay * ADAPTIVE_DELAY['grow'])
+                logger.warning(f"Throttling detected, delay increased to {self.current_delay:.2f}s")
+            else:
+                self.current_delay = max(ADAPTIVE_DELAY['min'], self.current_delay * ADAPTIVE_DELAY['shrink'])
+    
+    def _is_throttled(self):
+        """
+        Check whether the current page is a throttling or block page
+        
+        Returns:
+            bool: True if the page title matches THROTTLE_MARKERS
+        """
+        try:
+            title = self.driver.title.lower()
+        except Exception:
+            return False
+        return any(marker in title for marker in THROTTLE_MARKERS)
+    
+    def _wait(self, timeout=ELEMENT_WAIT_TIMEOUT):
+        """
+        Return the current driver's WebDriverWait for a timeout, built once
+        
+        Args:
+            timeout: Wait timeout
+            
+        Returns:
+            WebDriverWait bound to the current thread's driver
+        """
+        key = (self.driver, timeout)
+        wait = self._waits.get(key)
+        if wait is None:
+            wait = self._waits[key] = WebDriverWait(self.driver, timeout)
+        return wait
+    
+    def _safe_find_element(self, key, timeout=ELEMENT_WAIT_TIMEOUT, visible=False):
         """
         Safely find element with wait
         
         Args:
-            by: Selenium By locator
-            selector: CSS selector or XPath
+            key: SELECTORS key of the element
             timeout: Wait timeout
-            parent: Parent element to search within
+            visible: Wait until the element is displayed, not just present
             
         Returns:
             WebElement or None
         """
         try:
-            element_source = parent if parent else self.driver
-            element = WebDriverWait(element_source, timeout).until(
-                EC.presence_of_element_located((by, selector))
-            )
-            return element
+            return self._wait(timeout).until(VISIBLE[key] if visible else PRESENCE[key])
         except TimeoutException:
             return None
     
-    def _safe_find_elements(self, by, selector, timeout=ELEMENT_WAIT_TIMEOUT, parent=None):
+    def _wait_until_gone(self, element, timeout=2):
+        """
+        Wait until an element is hidden or removed, ignoring timeouts
+        
+        Args:
+            element: WebElement to wait for
+            timeout: Wait timeout
+        """
+        try:
+            self._wait(timeout).until(EC.invisibility_of_element(element))
+        except TimeoutException:
+            pass
+    
+    def _safe_find_elements(self, key, timeout=ELEMENT_WAIT_TIMEOUT):
         """
         Safely find multiple elements
         
         Args:
-            by: Selenium By locator
-            selector: CSS selector or XPath
+            key: SELECTORS key of the elements
             timeout: Wait timeout
-            parent: Parent element to search within
             
         Returns:
             List of WebElements
         """
         try:
-            element_source = parent if parent else self.driver
-            WebDriverWait(element_source, timeout).until(
-                EC.presence_of_element_located((by, selector))
-            )
-            return element_source.find_elements(by, selector)
+            self._wait(timeout).until(PRESENCE[key])
+            return self.driver.find_elements(*LOCATORS[key])
         except TimeoutException:
             return []
     
-    def _get_text_safe(self, element, selector=None):
+    def _get_text_safe(self, element, locator=None):
         """
         Safely extract text from element
         
         Args:
             element: WebElement or driver
-            selector: Optional CSS selector
+            locator: Optional (By, selector) tuple, e.g. from LOCATORS
             
         Returns:
             str: Extracted text or empty string
         """
         try:
-            if selector:
-                target = element.find_element(By.CSS_SELECTOR, selector)
+            if locator:
+                target = element.find_element(*locator)
             else:
                 target = element
             return target.text.strip()
@@ -153,13 +725,14 @@ class NoonScraper:
             
             # Navigate to search URL
             search_url = f"{SEARCH_URL}{keyword}"
-            self.driver.get(search_url)
+            self._load(search_url)
+            self._record_response(self._is_throttled())
             
             # Wait for results to load
             self._random_delay(2, 3)
             
             # Check if results loaded
-            results = self._safe_find_elements(By.CSS_SELECTOR, SELECTORS['product_card'], timeout=10)
+            results = self._safe_find_elements('product_card', timeout=10)
             
             if results:
                 logger.info(f"Found {len(results)} products on first page")
@@ -172,36 +745,63 @@ class NoonScraper:
             logger.error(f"Error searching for keyword '{keyword}': {str(e)}")
             return False
     
-    def _extract_category(self):
-        """Extract category from breadcrumbs"""
+    def _read_page_fields(self, fields):
+        """
+        Format the common product fields read from the page
+        
+        Args:
+            fields (dict): Raw values returned by _extract_fields
+            
+        Returns:
+            dict: title, category, description, rating and reviews as strings
+        """
+        rating = fields.get('rating')
+        reviews = fields.get('reviews')
+        
+        return {
+            'title': fields.get('title') or "",
+            'category': ' > '.join(fields.get('category') or []) or "N/A",
+            'description': ' | '.join(fields.get('description') or []) or "N/A",
+            'rating': "N/A" if rating is None else rating,
+            'reviews': "N/A" if reviews is None else reviews,
+        }
+    
+    def _extract_fields(self):
+        """
+        Read every product field with a single execute_script call
+        
+        Returns:
+            dict: title, category, description, rating, reviews, price and
+                primarySeller as returned by EXTRACT_JS, or an empty dict
+                on failure
+        """
         try:
-            breadcrumbs = self._safe_find_elements(By.CSS_SELECTOR, SELECTORS['breadcrumbs'])
-            if breadcrumbs:
-                # Get all breadcrumb texts except "Home"
-                categories = [bc.text.strip() for bc in breadcrumbs if bc.text.strip() and bc.text.strip().lower() != 'home']
-                return ' > '.join(categories) if categories else "N/A"
-            return "N/A"
-        except:
-            return "N/A"
+            return self.driver.execute_script(EXTRACT_JS, SELECTORS) or {}
+        except Exception as e:
+            logger.debug(f"Batched field extraction failed: {str(e)}")
+            return {}
     
-    def _extract_description(self):
-        """Extract product description/highlights"""
+    def _press_escape(self):
+        """Press ESC on the current page, via CDP when available"""
         try:
-            # Try to find highlights section
-            highlights = self._safe_find_elements(By.CSS_SELECTOR, SELECTORS['highlights'])
-            if highlights:
-                desc_parts = [h.text.strip() for h in highlights[:3]]  # Get first 3 highlights
-                return ' | '.join(desc_parts) if desc_parts else "N/A"
-            return "N/A"
-        except:
-            return "N/A"
+            for event_type in ('keyDown', 'keyUp'):
+                self.driver.execute_cdp_cmd('Input.dispatchKeyEvent', {
+                    'type': event_type,
+                    'key': 'Escape',
+                    'code': 'Escape',
+                    'windowsVirtualKeyCode': 27,
+                })
+        except Exception:
+            self.driver.find_element(By.TAG_NAME, 'body').send_keys(Keys.ESCAPE)
     
-    def _extract_sellers(self, product_url):
+    def _extract_sellers(self, product_url, fields):
         """
         Extract all sellers for a product
         
         Args:
             product_url (str): Product URL
+            fields (dict): Raw page values from _extract_fields, which
+                include the primary seller and price
             
         Returns:
             list: List of seller dictionaries
@@ -209,31 +809,19 @@ class NoonScraper:
         sellers = []
         
         try:
-            # Wait for price element to load
-            price_element = self._safe_find_element(By.CSS_SELECTOR, SELECTORS['price_now'], timeout=5)
+            primary_seller = fields.get('primarySeller')
             
-            # Find primary seller
-            primary_seller = self._get_text_safe(self.driver, SELECTORS['seller_name'])
-            
-            # Extract price using JavaScript textContent (more reliable than .text)
-            if price_element:
-                try:
-                    price_text = self.driver.execute_script("return arguments[0].textContent;", price_element)
-                    # Clean price text - remove any non-printable characters and extra whitespace
-                    if price_text:
-                        import re
-                        # Remove Unicode special characters and keep only digits, decimal points, and basic ASCII
-                        price_text = re.sub(r'[^\x20-\x7E]', '', price_text)  # Keep only printable ASCII
-                        price_text = price_text.strip()
-                        primary_price = f"AED {price_text}" if price_text else "N/A"
-                    else:
-                        primary_price = "N/A"
-                except:
-                    primary_price = "N/A"
+            # Price comes from textContent (more reliable than .text)
+            price_text = fields.get('price')
+            if price_text:
+                # Remove Unicode special characters and keep only digits, decimal points, and basic ASCII
+                price_text = _NON_PRINTABLE.sub('', price_text)  # Keep only printable ASCII
+                price_text = price_text.strip()
+                primary_price = f"AED {price_text}" if price_text else "N/A"
             else:
                 primary_price = "N/A"
             
-            primary_rating = self._get_text_safe(self.driver, SELECTORS['rating_value'])
+            primary_rating = fields.get('rating') or ""
             
             # Log price extraction for debugging
             if primary_price == "N/A":
@@ -242,41 +830,55 @@ class NoonScraper:
                 logger.info(f"Extracted price: {primary_price}")
             
             # Always add primary seller (default to 'noon' if not found)
+            primary_seller = primary_seller if primary_seller else 'noon'
             sellers.append({
-                'name': primary_seller if primary_seller else 'noon',
+                'name': primary_seller,
                 'price': primary_price,
                 'rating': primary_rating
             })
+            seen = {primary_seller}
             
             # Check for other sellers button
             try:
-                # Look for "other seller" button using XPath
-                other_sellers_buttons = self.driver.find_elements(By.XPATH, "//button[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'other seller')]")
+                # Look for "other seller" button by attribute, then by its text
+                other_sellers_buttons = self.driver.find_elements(*LOCATORS['other_sellers_button'])
+                if not other_sellers_buttons:
+                    other_sellers_buttons = self.driver.find_elements(*_OTHER_SELLERS_XPATH)
                 
                 if other_sellers_buttons:
                     logger.info(f"Found 'Other Sellers' button, clicking to view all sellers...")
                     
-                    # Click the button
+                    # Click the button once it is scrolled into view and clickable
                     self.driver.execute_script("arguments[0].scrollIntoView(true);", other_sellers_buttons[0])
-                    time.sleep(0.5)
+                    try:
+                        self._wait(2).until(EC.element_to_be_clickable(other_sellers_buttons[0]))
+                    except TimeoutException:
+                        pass
                     other_sellers_buttons[0].click()
                     
-                    # Wait for modal to appear
-                    time.sleep(2)
-                    
-                    # Extract sellers from modal
-                    modal_sellers = self._safe_find_elements(By.CSS_SELECTOR, SELECTORS['modal_sellers'], timeout=5)
+                    # Wait for the modal itself; seller cards are only looked up
+                    # inside it, since their selector also matches the page
+                    modal = self._safe_find_element('sellers_modal', timeout=4, visible=True)
+                    if modal is None:
+                        logger.warning("Sellers modal did not open, keeping the primary seller only")
+                        return sellers
+                    try:
+                        modal_sellers = self._wait(4).until(
+                            lambda driver: modal.find_elements(*LOCATORS['modal_sellers']))
+                    except TimeoutException:
+                        modal_sellers = []
                     
                     logger.info(f"Found {len(modal_sellers)} seller cards in modal")
                     
                     for seller_card in modal_sellers:
                         try:
-                            seller_name = self._get_text_safe(seller_card, SELECTORS['modal_seller_name'])
-                            seller_price = self._get_text_safe(seller_card, SELECTORS['modal_seller_price'])
-                            seller_rating = self._get_text_safe(seller_card, SELECTORS['modal_seller_rating'])
+                            seller_name = self._get_text_safe(seller_card, LOCATORS['modal_seller_name'])
+                            seller_price = self._get_text_safe(seller_card, LOCATORS['modal_seller_price'])
+                            seller_rating = self._get_text_safe(seller_card, LOCATORS['modal_seller_rating'])
                             
                             # Avoid duplicates
-                            if seller_name and not any(s['name'] == seller_name for s in sellers):
+                            if seller_name and seller_name not in seen:
+                                seen.add(seller_name)
                                 sellers.append({
                                     'name': seller_name,
                                     'price': seller_price if seller_price else primary_price,
@@ -287,14 +889,12 @@ class NoonScraper:
                     
                     # Close modal
                     try:
-                        close_buttons = self.driver.find_elements(By.CSS_SELECTOR, SELECTORS['close_modal'])
+                        close_buttons = modal.find_elements(*LOCATORS['close_modal'])
                         if close_buttons:
                             close_buttons[0].click()
-                            time.sleep(0.5)
                         else:
-                            # Press ESC key
-                            self.driver.find_element(By.TAG_NAME, 'body').send_keys(Keys.ESCAPE)
-                            time.sleep(0.5)
+                            self._press_escape()
+                        self._wait_until_gone(modal)
                     except:
                         pass
                         
@@ -323,50 +923,52 @@ class NoonScraper:
             keyword (str): Search keyword used
             
         Returns:
-            list: List of product data dictionaries (one per seller)
+            list: List of Product rows (one per seller)
         """
         product_data_list = []
+        self._local.throttled = False
         
         try:
             logger.info(f"Scraping product: {product_url}")
             
-            # Navigate to product page
-            self.driver.get(product_url)
-            self._random_delay(PRODUCT_DETAIL_DELAY, PRODUCT_DETAIL_DELAY + 1)
-            
-            # Scroll to load content and wait for price to appear
-            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight/2);")
-            time.sleep(2)  # Increased wait time for dynamic content
-            
-            # Extract common product information
-            title = self._get_text_safe(self.driver, SELECTORS['product_title'])
-            category = self._extract_category()
-            description = self._extract_description()
-            
-            # Extract rating and reviews
-            rating_element = self._safe_find_element(By.CSS_SELECTOR, SELECTORS['rating_value'])
-            rating = self._get_text_safe(rating_element) if rating_element else "N/A"
+            # Product pages embed their data as JSON, so try plain HTTP first
+            details = self._fetch_product_details(product_url)
             
-            reviews_element = self._safe_find_element(By.CSS_SELECTOR, SELECTORS['reviews_count'])
-            reviews = self._get_text_safe(reviews_element) if reviews_element else "N/A"
-            
-            # Extract all sellers (includes price extraction)
-            sellers = self._extract_sellers(product_url)
+            if details and details['offer_count'] is not None and len(details['sellers']) >= details['offer_count']:
+                # Every offer is described by the HTML, no browser needed
+                fields = details
+                sellers = details['sellers']
+            else:
+                # Navigate to product page
+                self._load(product_url)
+                self._local.throttled = self._is_throttled()
+                self._record_response(self._local.throttled)
+                
+                # Let lazy content settle, make sure the price is there, then
+                # read every field in one round-trip
+                self._wait_for_network_idle()
+                self._safe_find_element('price_now', timeout=5)
+                page_fields = self._extract_fields()
+                
+                # Only the sellers modal needs the browser when JSON-LD was found
+                fields = details or self._read_page_fields(page_fields)
+                
+                # Extract all sellers (includes price extraction)
+                sellers = self._extract_sellers(product_url, page_fields)
             
             # Create a row for each seller
             for seller in sellers:
-                product_data = {
-                    'Search Keyword': keyword,
-                    'Category': category,
-                    'Title': title,
-                    'Description': description,
-                    'Price': seller['price'],
-                    'Rating': rating,
-                    'Reviews': reviews,
-                    'Seller': seller['name'],
-                    'Product URL': product_url
-                }
-                product_data_list.append(product_data)
+                product_data_list.append(Product(
+                    search_keyword=keyword,
+                    category=fields['category'],
+                    title=fields['title'],
+                    description=fields['description'],
+                    price=seller['price'],
+                    rating=fields['rating'],
+                    reviews=fields['reviews'],
+                    seller=seller['name'],
+                    product_url=product_url
+                ))
             
             logger.info(f"Scraped product with {len(sellers)} seller(s)")
             
@@ -375,57 +977,171 @@ class NoonScraper:
         
         return product_data_list
     
-    def scrape_search_results(self, keyword, max_products=None):
+    def _http_session(self):
+        """Return the scraper's HTTP client, creating it on first use"""
+        with self._data_lock:
+            if self.http is None:
+                # Pooled keep-alive connections, shared by every product worker
+                limits = httpx.Limits(max_connections=HTTP_MAX_CONNECTIONS,
+                                      max_keepalive_connections=HTTP_MAX_CONNECTIONS)
+                self.http = httpx.Client(limits=limits, timeout=HTTP_TIMEOUT, follow_redirects=True)
+            return self.http
+    
+    def _fetch_product_details(self, product_url):
+        """
+        Fetch a product page over plain HTTP and parse its embedded data
+        
+        The Next.js state is tried first since it includes every seller;
+        JSON-LD is the fallback.
+        
+        Args:
+            product_url (str): URL of product
+            
+        Returns:
+            dict: Parsed fields (see parse_product_json_ld), or None if the
+                page could not be fetched or has no usable product data
+        """
+        try:
+            response = self._http_session().get(product_url, headers={'User-Agent': random.choice(USER_AGENTS)})
+            # Throttling answers slow the scraper down like a block page would
+            if response.status_code in THROTTLE_STATUSES:
+                self._record_response(True)
+            elif response.status_code == 200:
+                self._record_response(False)
+            if response.status_code != 200:
+                logger.debug(f"Product page returned HTTP {response.status_code}, using the browser")
+                return None
+            return parse_product_next_data(response.text) or parse_product_json_ld(response.text)
+        except Exception as e:
+            logger.debug(f"HTTP product fetch failed for {product_url}: {str(e)}")
+            return None
+    
+    def _collect_product_urls(self, keyword):
+        """
+        Collect product URLs for a keyword with a browser search
+        
+        Used when the search page's HTML, fetched over HTTP by scrape(),
+        lists no products.
+        
+        Args:
+            keyword (str): Search keyword
+            
+        Returns:
+            list: Product URLs found on the search results page
+        """
+        # Search for keyword
+        if not self.search_keyword(keyword):
+            return []
+        
+        # Scroll to load more products
+        self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight/3);")
+        
+        # Try multiple selectors to find product links
+        product_urls = []
+        
+        # Method 1: Try finding product cards first
+        product_cards = self._safe_find_elements('product_card', timeout=5)
+        logger.info(f"Found {len(product_cards)} product cards")
+        
+        if product_cards:
+            for card in product_cards:
+                try:
+                    # Try to find link within card
+                    link = card if card.tag_name == 'a' else card.find_element(By.TAG_NAME, 'a')
+                    url = link.get_attribute('href')
+                    if url and '/p/' in url and url not in product_urls:
+                        product_urls.append(url)
+                except:
+                    continue
+        
+        # Method 2: If no URLs found, try finding all links with /p/ in href
+        if not product_urls:
+            logger.info("Trying alternative method to find product links...")
+            try:
+                product_urls = list(dict.fromkeys(self.driver.execute_script(PRODUCT_LINKS_JS) or []))
+            except Exception as e:
+                logger.debug(f"Product link lookup failed: {str(e)}")
+        
+        return product_urls
+    
+    def _emit(self, product_data):
+        """
+        Hand rows to the result sink as soon as their product is done
+        
+        Args:
+            product_data (list): Product rows
+        """
+        with self._data_lock:
+            self.rows_scraped += len(product_data)
+        if self.result_sink:
+            for row in product_data:
+                self.result_sink(row)
+    
+    def _scrape_with_pooled_driver(self, product_url, keyword):
+        """
+        Scrape one product with a browser slot borrowed from the pool
+        
+        Args:
+            product_url (str): URL of product
+            keyword (str): Search keyword used
+            
+        Returns:
+            list: List of Product rows (one per seller)
+        """
+        # Products scraped by an earlier run need no page load and no delay
+        product_data = self.cache.get(product_url, keyword) if self.cache else None
+        if product_data is not None:
+            logger.info(f"Using cached product: {product_url}")
+            self._emit(product_data)
+            return product_data
+        
+        # Adaptive delay between products
+        self._adaptive_delay()
+        
+        with self._pooled_driver():
+            product_data = self.scrape_product_details(product_url, keyword)
+        if product_data and self.cache and self._cacheable(product_data):
+            self.cache.put(product_url, keyword, product_data)
+        self._emit(product_data)
+        return product_data
+    
+    def _cacheable(self, product_data):
+        """
+        Check whether freshly scraped rows are worth replaying from the cache
+        
+        Block pages and pages that never rendered still produce a fallback
+        seller row, so rows are only cached when the current thread's last
+        product page was not throttled and has a title and a price.
+        
+        Args:
+            product_data (list): Product rows from scrape_product_details
+            
+        Returns:
+            bool: True if the rows may be cached
+        """
+        primary = product_data[0]
+        return not self._local.throttled and bool(primary.title) and primary.price != "N/A"
+    
+    def scrape_search_results(self, keyword, max_products=None, product_urls=None):
         """
         Scrape all products from search results
         
         Args:
             keyword (str): Search keyword
             max_products (int): Maximum number of products to scrape (None for all)
+            product_urls (list): Product URLs read from the search page
+                over HTTP; the browser search only runs when this is empty
             
         Returns:
-            list: List of all scraped product data
+            list: List of all scraped product data (empty when rows go to
+                a result sink instead)
         """
         all_data = []
         
         try:
-            # Search for keyword
-            if not self.search_keyword(keyword):
-                return all_data
-            
-            # Scroll to load more products
-            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight/3);")
-            time.sleep(1)
-            
-            # Try multiple selectors to find product links
-            product_urls = []
-            
-            # Method 1: Try finding product cards first
-            product_cards = self._safe_find_elements(By.CSS_SELECTOR, SELECTORS['product_card'], timeout=5)
-            logger.info(f"Found {len(product_cards)} product cards")
-            
-            if product_cards:
-                for card in product_cards:
-                    try:
-                        # Try to find link within card
-                        link = card if card.tag_name == 'a' else card.find_element(By.TAG_NAME, 'a')
-                        url = link.get_attribute('href')
-                        if url and '/p/' in url and url not in product_urls:
-                            product_urls.append(url)
-                    except:
-                        continue
-            
-            # Method 2: If no URLs found, try finding all links with /p/ in href
             if not product_urls:
-                logger.info("Trying alternative method to find product links...")
-                all_links = self.driver.find_elements(By.TAG_NAME, 'a')
-                for link in all_links:
-                    try:
-                        url = link.get_attribute('href')
-                        if url and '/p/' in url and '/uae-en/' in url and url not in product_urls:
-                            product_urls.append(url)
-                    except:
-                        continue
+                with self._pooled_driver():
+                    product_urls = self._collect_product_urls(keyword)
             
             if not product_urls:
                 logger.warning("No product URLs found on search results page")
@@ -437,13 +1153,18 @@ class NoonScraper:
             
             logger.info(f"Found {len(product_urls)} products to scrape")
             
-            # Scrape each product with progress bar
-            for url in tqdm(product_urls, desc=f"Scraping '{keyword}'", unit="product"):
-                product_data = self.scrape_product_details(url, keyword)
-                all_data.extend(product_data)
-                
-                # Random delay between products
-                self._random_delay()
+            # Scrape products in parallel; each worker borrows a browser slot
+            # from the scraper's pool, so the search browser is reused and no
+            # more than product_workers browsers are ever started
+            with ThreadPoolExecutor(max_workers=self.product_workers) as executor:
+                futures = [executor.submit(self._scrape_with_pooled_driver, url, keyword)
+                           for url in product_urls]
+                for future in tqdm(as_completed(futures), total=len(futures),
+                                   desc=f"Scraping '{keyword}'", unit="product"):
+                    # Rows already handed to a sink are not kept in memory
+                    rows = future.result()
+                    if not self.result_sink:
+                        all_data.extend(rows)
             
             logger.info(f"Completed scraping {len(product_urls)} products")
             
@@ -452,50 +1173,64 @@ class NoonScraper:
         
         return all_data
     
-    def scrape(self, keywords, max_products_per_keyword=None):
+    def scrape(self, keywords, max_products_per_keyword=None, result_sink=None, product_urls=None):
         """
         Main scraping method
         
         Args:
             keywords (list or str): Keyword(s) to search
             max_products_per_keyword (int): Max products per keyword
+            result_sink (callable): Optional callback receiving each row as
+                soon as its product is scraped (e.g. NdjsonWriter.write);
+                rows sent to it are not kept, see rows_scraped for the count
+            product_urls (dict): Optional keyword -> product URLs already
+                fetched with fast_search.fetch_product_urls; other keywords'
+                search pages are fetched here
             
         Returns:
-            list: All scraped data
+            list: All scraped data (empty when a result sink is given)
         """
         # Convert single keyword to list
         if isinstance(keywords, str):
             keywords = [keywords]
         
+        self.result_sink = result_sink
+        product_urls = dict(product_urls or {})
+        
+        # Read the remaining search pages over HTTP/2 and drop keywords whose
+        # page does not exist before paying for a browser
+        unfetched = [kw for kw in keywords if kw not in product_urls]
+        if unfetched:
+            product_urls.update(fetch_product_urls(unfetched))
+        keywords = [kw for kw in keywords if product_urls[kw] is not None]
+        if not keywords:
+            logger.warning("No search pages available, browser not started")
+            return self.scraped_data
+        
+        # The browser is started by the first page that needs it and kept
+        # open for later calls; call close() when done
         try:
-            # Initialize driver
-            self._init_driver()
-            
             # Scrape each keyword
             for keyword in keywords:
                 logger.info(f"\n{'='*60}")
                 logger.info(f"Starting scrape for keyword: '{keyword}'")
                 logger.info(f"{'='*60}\n")
                 
-                data = self.scrape_search_results(keyword, max_products_per_keyword)
-                self.scraped_data.extend(data)
+                rows_before = self.rows_scraped
+                data = self.scrape_search_results(keyword, max_products_per_keyword, product_urls.get(keyword))
+                with self._data_lock:
+                    self.scraped_data.extend(data)
                 
-                logger.info(f"Scraped {len(data)} rows for keyword '{keyword}'")
+                logger.info(f"Scraped {self.rows_scraped - rows_before} rows for keyword '{keyword}'")
             
             logger.info(f"\n{'='*60}")
             logger.info(f"SCRAPING COMPLETED")
-            logger.info(f"Total rows scraped: {len(self.scraped_data)}")
+            logger.info(f"Total rows scraped: {self.rows_scraped}")
             logger.info(f"{'='*60}\n")
             
         except Exception as e:
             logger.error(f"Error during scraping: {str(e)}")
         
-        finally:
-            # Close driver
-            if self.driver:
-                self.driver.quit()
-                logger.info("Browser closed")
-        
         return self.scraped_data
     
     def get_data(self):
@@ -0,0 +1,88 @@
+"""
+Product Cache Module
+Keeps scraped product rows between runs so unchanged products are not re-scraped
+"""
+
+import atexit
+import shelve
+import threading
+import time
+from config import CACHE_FILE, CACHE_TTL, Product
+
+
+class ProductCache:
+    """Thread-safe shelve cache of scraped rows, keyed by product URL and keyword"""
+    
+    def __init__(self, filepath=CACHE_FILE, ttl=CACHE_TTL):
+        """
+        Open (or create) the cache file
+        
+        Args:
+            filepath (str): Base path of the shelve files
+            ttl (float): Seconds a cached product stays valid
+        """
+        self.ttl = ttl
+        self._shelf = shelve.open(filepath)
+        self._lock = threading.Lock()
+    
+    def get(self, product_url, keyword):
+        """
+        Look up the rows scraped for a product
+        
+        Args:
+            product_url (str): URL of product
+            keyword (str): Search keyword used
+            
+        Returns:
+            list: Cached Product rows, or None if missing or expired
+        """
+        with self._lock:
+            entry = self._shelf.get(f"{product_url}|{keyword}")
+        if entry is None:
+            return None
+        
+        timestamp, rows = entry
+        if time.time() - timestamp >= self.ttl:
+            return None
+        return [Product(*row) for row in rows]
+    
+    def put(self, product_url, keyword, rows):
+        """
+        Store the rows scraped for a product
+        
+        Args:
+            product_url (str): URL of product
+            keyword (str): Search keyword used
+            rows (list): Product rows (one per seller)
+        """
+        # Rows are stored as plain tuples, which pickle smaller than named tuples
+        entry = (time.time(), [tuple(row) for row in rows])
+        with self._lock:
+            self._shelf[f"{product_url}|{keyword}"] = entry
+    
+    def close(self):
+        """Write pending entries and close the cache file"""
+        with self._lock:
+            self._shelf.close()
+
+
+_shared_cache = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_cache():
+    """
+    Return the process-wide cache, opening it on first use
+    
+    A shelve file must not be opened twice, so every scraper in the
+    process shares one instance. It is closed at interpreter exit.
+    
+    Returns:
+        ProductCache: The shared cache
+    """
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = ProductCache()
+            atexit.register(_shared_cache.close)
+        return _shared_cache
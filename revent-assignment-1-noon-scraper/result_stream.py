@@ -0,0 +1,74 @@
+"""
+Result Stream Module
+Streams scraped records to an NDJSON file as they are produced
+"""
+
+import threading
+from config import NDJSON_BUFFER_SIZE, JSON_LIB, Product
+
+
+if hasattr(JSON_LIB, 'OPT_APPEND_NEWLINE'):
+    def _dumps_line(record):
+        """Serialize a record to a UTF-8 JSON array line (orjson needs named tuples as plain tuples)"""
+        return JSON_LIB.dumps(record, default=tuple, option=JSON_LIB.OPT_APPEND_NEWLINE)
+else:
+    def _dumps_line(record):
+        """Serialize a record to a UTF-8 JSON array line (standard library json)"""
+        return (JSON_LIB.dumps(record, ensure_ascii=False) + '\n').encode('utf-8')
+
+
+class NdjsonWriter:
+    """Thread-safe, buffered writer of one JSON record per line"""
+    
+    def __init__(self, filepath):
+        """
+        Open the NDJSON file for writing
+        
+        Args:
+            filepath (str): Path to the NDJSON file
+        """
+        self.filepath = filepath
+        self.records_written = 0
+        self._file = open(filepath, 'wb', buffering=NDJSON_BUFFER_SIZE)
+        self._lock = threading.Lock()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+    
+    def write(self, record):
+        """
+        Append a record to the stream
+        
+        Args:
+            record (Product): Scraped product row
+        """
+        line = _dumps_line(record)
+        with self._lock:
+            self._file.write(line)
+            self.records_written += 1
+    
+    def close(self):
+        """Flush buffered records and close the file"""
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+
+def read_ndjson(filepath):
+    """
+    Lazily read records back from an NDJSON file
+    
+    Args:
+        filepath (str): Path to the NDJSON file
+        
+    Yields:
+        Product: One record per non-empty line
+    """
+    with open(filepath, 'rb') as f:
+        for line in f:
+            if line.strip():
+                yield Product(*JSON_LIB.loads(line))
@@ -3,15 +3,12 @@ Test script for Noon Web Scraper
 Tests basic functionality with a limited scrape
 """
 
-from noon_scraper import NoonScraper
+from noon_scraper import NoonScraper, setup_logging
 from excel_exporter import ExcelExporter
-import logging
+from config import EXCEL_HEADERS
 
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
+setup_logging()
 
 def test_scraper():
     """Test the scraper with a single keyword and limited products"""
@@ -29,7 +26,10 @@ def test_scraper():
         
         # Scrape
         print("Starting scrape...\n")
-        data = scraper.scrape(keywords=['iphone'], max_products_per_keyword=3)
+        try:
+            data = scraper.scrape(keywords=['iphone'], max_products_per_keyword=3)
+        finally:
+            scraper.close()
         
         # Check results
         if data:
@@ -38,8 +38,8 @@ def test_scraper():
             # Display sample data
             print("\nSample data (first row):")
             print("-" * 60)
-            for key, value in data[0].items():
-                print(f"{key}: {value}")
+            for header, value in zip(EXCEL_HEADERS, data[0]):
+                print(f"{header}: {value}")
             print("-" * 60)
             
             # Export to Excel
@@ -0,0 +1,8 @@
+"""
+Shared pytest setup: the scraper modules are imported from the project directory
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,23 @@
+"""
+Tests for search results HTML parsing
+"""
+
+from fast_search import extract_product_urls
+
+
+def test_extract_product_urls():
+    page = '''<html><body>
+        <a href="/uae-en/iphone-15/N1/p/">iPhone</a>
+        <a href="https://www.noon.com/uae-en/galaxy/N2/p/">Galaxy</a>
+        <a href="/uae-en/iphone-15/N1/p/">iPhone again</a>
+        <a href="/saudi-en/pixel/N3/p/">Other country</a>
+        <a href="/uae-en/search/?q=phone">Not a product</a>
+    </body></html>'''
+    assert extract_product_urls(page, 'https://www.noon.com/uae-en/search/?q=phone') == [
+        'https://www.noon.com/uae-en/iphone-15/N1/p/',
+        'https://www.noon.com/uae-en/galaxy/N2/p/',
+    ]
+
+
+def test_extract_product_urls_without_products():
+    assert extract_product_urls('<html><body><p>No results</p></body></html>') == []
@@ -0,0 +1,152 @@
+"""
+Tests for the product page parsers (JSON-LD and __NEXT_DATA__)
+"""
+
+import json
+import pytest
+from noon_scraper import parse_product_json_ld, parse_product_next_data
+
+
+def json_ld_page(*blocks):
+    """Product page HTML with the given JSON-LD blocks"""
+    scripts = ''.join(f'<script type="application/ld+json">{json.dumps(block)}</script>' for block in blocks)
+    return f'<html><head>{scripts}</head><body></body></html>'
+
+
+def next_data_page(product):
+    """Product page HTML with a __NEXT_DATA__ blob holding the given product"""
+    data = {'props': {'pageProps': {'catalog': {'product': product}}}}
+    return f'<html><script id="__NEXT_DATA__" type="application/json">{json.dumps(data)}</script></html>'
+
+
+def offer(seller, price):
+    """JSON-LD Offer sold by seller"""
+    return {'@type': 'Offer', 'price': price, 'priceCurrency': 'AED', 'seller': {'name': seller}}
+
+
+def product(offers, **fields):
+    """JSON-LD Product with the given offers"""
+    return {'@type': 'Product', 'name': ' iPhone 15 ', 'offers': offers, **fields}
+
+
+class TestJsonLdOfferCount:
+    """offer_count is only known when the data provably lists every offer"""
+    
+    def test_bare_offer_is_incomplete(self):
+        details = parse_product_json_ld(json_ld_page(product(offer('TechStore', 3999))))
+        assert details['offer_count'] is None
+        assert details['sellers'] == [{'name': 'TechStore', 'price': 'AED 3999', 'rating': 'N/A'}]
+    
+    def test_single_item_list_is_incomplete(self):
+        details = parse_product_json_ld(json_ld_page(product([offer('TechStore', 3999)])))
+        assert details['offer_count'] is None
+        assert len(details['sellers']) == 1
+    
+    def test_offer_list_is_complete(self):
+        details = parse_product_json_ld(json_ld_page(product([offer('A', 10), offer('B', 12)])))
+        assert details['offer_count'] == 2
+        assert [seller['name'] for seller in details['sellers']] == ['A', 'B']
+    
+    def test_duplicate_sellers_fall_short_of_the_count(self):
+        details = parse_product_json_ld(json_ld_page(product([offer('A', 10), offer('A', 11)])))
+        assert details['offer_count'] == 2
+        assert len(details['sellers']) == 1
+    
+    def test_aggregate_offer_with_offers_uses_offer_count(self):
+        aggregate = {'@type': 'AggregateOffer', 'offerCount': 3, 'lowPrice': 10,
+                     'offers': [offer('A', 10), offer('B', 12)]}
+        details = parse_product_json_ld(json_ld_page(product(aggregate)))
+        assert details['offer_count'] == 3
+        assert len(details['sellers']) == 2
+    
+    def test_aggregate_offer_without_offers_is_incomplete(self):
+        aggregate = {'@type': 'AggregateOffer', 'offerCount': 1, 'lowPrice': 10}
+        details = parse_product_json_ld(json_ld_page(product(aggregate)))
+        assert details['offer_count'] is None
+        assert details['sellers'] == [{'name': 'noon', 'price': 'AED 10', 'rating': 'N/A'}]
+    
+    @pytest.mark.parametrize('offer_count', ['many', None])
+    def test_aggregate_offer_with_bad_count_is_incomplete(self, offer_count):
+        aggregate = {'@type': 'AggregateOffer', 'offerCount': offer_count, 'offers': [offer('A', 10)]}
+        details = parse_product_json_ld(json_ld_page(product(aggregate)))
+        assert details['offer_count'] is None
+    
+    def test_empty_offer_list_keeps_a_fallback_seller(self):
+        details = parse_product_json_ld(json_ld_page(product([])))
+        assert details['offer_count'] is None
+        assert details['sellers'] == [{'name': 'noon', 'price': 'N/A', 'rating': 'N/A'}]
+
+
+class TestJsonLdFields:
+    """Fields other than the offers"""
+    
+    def test_product_fields_and_breadcrumbs(self):
+        breadcrumbs = {'@type': 'BreadcrumbList', 'itemListElement': [
+            {'name': 'Home'}, {'name': 'Electronics'}, {'item': {'name': 'Mobiles'}},
+        ]}
+        page = json_ld_page(
+            product(offer('A', 10), description=' 128GB ', aggregateRating={'ratingValue': 4.6, 'reviewCount': 120}),
+            breadcrumbs,
+        )
+        details = parse_product_json_ld(page)
+        assert details['title'] == 'iPhone 15'
+        assert details['category'] == 'Electronics > Mobiles'
+        assert details['description'] == '128GB'
+        assert details['rating'] == '4.6'
+        assert details['reviews'] == '120'
+    
+    def test_graph_and_invalid_blocks(self):
+        page = '<script type="application/ld+json">{not json</script>' + json_ld_page(
+            {'@graph': [{'@type': 'WebPage'}, product(offer('A', 10))]})
+        assert parse_product_json_ld(page)['title'] == 'iPhone 15'
+    
+    def test_page_without_product(self):
+        assert parse_product_json_ld(json_ld_page({'@type': 'WebPage', 'name': 'Home'})) is None
+        assert parse_product_json_ld('<html><body>No data</body></html>') is None
+
+
+class TestNextData:
+    """__NEXT_DATA__ parsing and its offer count"""
+    
+    PRODUCT = {
+        'product_title': 'iPhone 15',
+        'variants': [
+            {'offers': [{'store_name': 'A', 'sale_price': 10}, {'store_name': 'B', 'price': 12}]},
+            {'offers': [{'store_name': 'A', 'price': 11}, {'price': 13}]},
+        ],
+        'product_rating': {'value': 4.5, 'count': 80},
+        'breadcrumbs': [{'name': 'Home'}, {'name': 'Electronics'}],
+        'feature_bullets': [' 128GB ', '5G', 'USB-C', 'Extra'],
+    }
+    
+    def test_fields_and_deduplicated_sellers(self):
+        details = parse_product_next_data(next_data_page(self.PRODUCT))
+        assert details['title'] == 'iPhone 15'
+        assert details['category'] == 'Electronics'
+        assert details['description'] == '128GB | 5G | USB-C'
+        assert details['rating'] == '4.5'
+        assert details['reviews'] == '80'
+        assert details['sellers'] == [
+            {'name': 'A', 'price': 'AED 10', 'rating': 'N/A'},
+            {'name': 'B', 'price': 'AED 12', 'rating': 'N/A'},
+            {'name': 'noon', 'price': 'AED 13', 'rating': 'N/A'},
+        ]
+    
+    def test_offer_count_is_unknown_without_a_total(self):
+        assert parse_product_next_data(next_data_page(self.PRODUCT))['offer_count'] is None
+    
+    @pytest.mark.parametrize('key', ['total_offers', 'offers_count', 'offer_count'])
+    def test_offer_count_comes_from_the_blob(self, key):
+        details = parse_product_next_data(next_data_page({**self.PRODUCT, key: 5}))
+        assert details['offer_count'] == 5
+    
+    @pytest.mark.parametrize('page', [
+        '<html></html>',
+        '<script id="__NEXT_DATA__">{broken</script>',
+        '<script id="__NEXT_DATA__">{"props": {}}</script>',
+    ])
+    def test_missing_or_malformed_blob(self, page):
+        assert parse_product_next_data(page) is None
+    
+    def test_product_without_offers(self):
+        assert parse_product_next_data(next_data_page({'product_title': 'iPhone 15'})) is None
@@ -0,0 +1,77 @@
+"""
+Tests for the product cache, the NDJSON result stream and the raw XML export
+"""
+
+import openpyxl
+from config import Product, EXCEL_HEADERS
+from product_cache import ProductCache
+from result_stream import NdjsonWriter, read_ndjson
+from excel_exporter import ExcelExporter
+
+ROWS = [
+    Product('iphone', 'Electronics', 'iPhone 15 "Pro"', '128GB | 5G', 'AED 3,999', '4.6', '12.8K', 'noon',
+            'https://www.noon.com/uae-en/p/1'),
+    Product('iphone', 'Electronics', 'iPhone 15 <Pro> & more', 'عربي', 'AED 4,100', 'N/A', 'N/A', 'TechStore',
+            'https://www.noon.com/uae-en/p/1'),
+]
+
+
+class TestProductCache:
+    """Cached rows are returned per URL and keyword until they expire"""
+    
+    def test_round_trip(self, tmp_path):
+        cache = ProductCache(str(tmp_path / 'cache'), ttl=60)
+        try:
+            cache.put('https://x/p/1', 'iphone', ROWS)
+            rows = cache.get('https://x/p/1', 'iphone')
+            assert rows == ROWS
+            assert all(isinstance(row, Product) for row in rows)
+            assert cache.get('https://x/p/1', 'samsung') is None
+            assert cache.get('https://x/p/2', 'iphone') is None
+        finally:
+            cache.close()
+    
+    def test_expired_entries_are_missing(self, tmp_path):
+        cache = ProductCache(str(tmp_path / 'cache'), ttl=0)
+        try:
+            cache.put('https://x/p/1', 'iphone', ROWS)
+            assert cache.get('https://x/p/1', 'iphone') is None
+        finally:
+            cache.close()
+    
+    def test_entries_survive_reopening(self, tmp_path):
+        path = str(tmp_path / 'cache')
+        cache = ProductCache(path, ttl=60)
+        cache.put('https://x/p/1', 'iphone', ROWS)
+        cache.close()
+        
+        cache = ProductCache(path, ttl=60)
+        try:
+            assert cache.get('https://x/p/1', 'iphone') == ROWS
+        finally:
+            cache.close()
+
+
+def test_ndjson_round_trip(tmp_path):
+    path = str(tmp_path / 'rows.ndjson')
+    with NdjsonWriter(path) as writer:
+        for row in ROWS:
+            writer.write(row)
+    
+    assert writer.records_written == len(ROWS)
+    assert list(read_ndjson(path)) == ROWS
+
+
+def test_raw_xml_export_opens_in_openpyxl(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    exporter = ExcelExporter()
+    filepath = str(tmp_path / 'raw.xlsx')
+    rows = ROWS + [Product('iphone', '', 'Bad \x01 char', '', 'AED 1', '', '', 'noon', '')]
+    exporter._write_raw_xml(filepath, rows, [len(header) for header in EXCEL_HEADERS])
+    
+    ws = openpyxl.load_workbook(filepath).active
+    values = [tuple(cell if cell is not None else '' for cell in row) for row in ws.iter_rows(values_only=True)]
+    assert values[0] == tuple(EXCEL_HEADERS)
+    assert values[1:3] == [tuple(row) for row in ROWS]
+    assert values[3][2] == 'Bad  char'
+    assert ws.freeze_panes == 'A2'
@@ -8,70 +8,205 @@ import pandas as pd
 from pathlib import Path
 import sys
 import glob
+import os
+import pickle
+import hashlib
+import argparse
+import gc
+import xlsxwriter
+from enum import Enum, auto
+from itertools import chain
+from concurrent.futures import ThreadPoolExecutor
 from tqdm import tqdm
 
 
+class OpKind(Enum):
+    """Transformation a remark asks for, classified once per summary column"""
+    NONE = auto()
+    NA = auto()
+    DAY = auto()
+    MONTH = auto()
+    YEAR = auto()
+    MULTIPLY = auto()
+    CONDITIONAL = auto()
+
+
+# Remark phrases that ask for a date component
+DATE_COMPONENTS = {
+    'day number from date': OpKind.DAY,
+    'month from date': OpKind.MONTH,
+    'year from date': OpKind.YEAR,
+}
+
+# Source column values, stored as int8 category codes instead of one string per row
+SOURCE_DTYPE = pd.CategoricalDtype(['Noon', 'Amazon'])
+
+# Excel stores dates as days since 1899-12-30, up to 9999-12-31
+EXCEL_EPOCH = pd.Timestamp('1899-12-30')
+EXCEL_MAX_SERIAL = 2958465
+
+# Rust-based calamine parses XLSX much faster than openpyxl; fall back to
+# openpyxl in read-only mode when python-calamine is not installed
+try:
+    import python_calamine  # noqa: F401
+    EXCEL_READ_OPTIONS = {'engine': 'calamine'}
+except ImportError:
+    EXCEL_READ_OPTIONS = {'engine': 'openpyxl', 'engine_kwargs': {'read_only': True, 'data_only': True}}
+
+# xlsxwriter in constant_memory mode flushes each row to disk as it is
+# written instead of holding the whole workbook in memory. Strings are
+# written as-is, like openpyxl does, never turned into formulas or links.
+WORKBOOK_OPTIONS = {
+    'constant_memory': True,
+    'strings_to_formulas': False,
+    'strings_to_urls': False,
+    'default_date_format': 'yyyy-mm-dd hh:mm:ss',
+}
+HEADER_FORMAT = {'bold': True, 'border': 1, 'align': 'center', 'valign': 'top'}
+WRITE_BATCH_ROWS = 10000  # Rows written between progress bar updates
+
+# Parsed sheets are cached here, keyed by input path, mtime and size. They are
+# pickled, since Excel columns that mix numbers and text cannot be stored as
+# parquet; loading a pickle can run code, so the cache lives in the user's own
+# cache directory (created 0700) rather than the working directory
+CACHE_DIR = Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache') / 'report_merger'
+
 
 class ReportMerger:
     """Merges Amazon and Noon reports based on dynamic column mapping"""
     
-    def __init__(self, excel_file_path):
+    def __init__(self, excel_file_path, use_cache=True):
         """
         Initialize the Report Merger
         
         Args:
             excel_file_path: Path to the Excel file containing all sheets
+            use_cache: Reuse sheets parsed by an earlier run on the same file
         """
         self.excel_file_path = excel_file_path
-        self.excel_file = pd.ExcelFile(excel_file_path)
+        self.use_cache = use_cache
+        self.sheet_names = []
         self.column_relations = None
         self.amazon_data = None
         self.noon_data = None
         self.summary_data = None
+        self.noon_ops = None
+        self.amazon_ops = None
+        self.noon_price_col = None
+        self.noon_qty_col = None
+        self.amazon_price_col = None
+        self.amazon_qty_col = None
         
     def _find_sheet(self, keyword):
         """Helper to find sheet by keyword"""
-        for sheet in self.excel_file.sheet_names:
+        for sheet in self.sheet_names:
             if keyword in sheet.lower():
                 return sheet
         return None
     
+    def _cache_path(self):
+        """Cache file for the current version of the input file"""
+        path = Path(self.excel_file_path).resolve()
+        stat = path.stat()
+        key = hashlib.sha1(f"{path}|{stat.st_mtime_ns}|{stat.st_size}".encode()).hexdigest()
+        return CACHE_DIR / f"{key}.pkl"
+    
+    def _read_cache(self, cache_path):
+        """Return (sheet names, relations, amazon, noon) from the cache, or None"""
+        try:
+            with open(cache_path, 'rb') as f:
+                return pickle.load(f)
+        except Exception:
+            return None
+    
+    def _write_cache(self, cache_path):
+        """Store the parsed sheets so the next run can skip reading the Excel file"""
+        entry = (self.sheet_names, self.column_relations, self.amazon_data, self.noon_data)
+        try:
+            cache_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix('.tmp')
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            tmp_path.replace(cache_path)
+        except OSError as e:
+            print(f"Warning: could not write cache: {e}")
+    
     def load_sheets(self):
-        """Load all required sheets from the Excel file"""
+        """Load all required sheets from the Excel file (or the cache)"""
         print("Loading sheets...")
-        print(f"Available sheets: {self.excel_file.sheet_names}")
+        
+        cache_path = self._cache_path() if self.use_cache else None
+        cached = self._read_cache(cache_path) if cache_path and cache_path.exists() else None
+        if cached:
+            self.sheet_names, self.column_relations, self.amazon_data, self.noon_data = cached
+            print(f"Available sheets: {self.sheet_names}")
+            print(f"✓ Loaded {len(self.column_relations)} mappings, {len(self.amazon_data)} Amazon rows, {len(self.noon_data)} Noon rows (cached)")
+        else:
+            self._read_workbook()
+            if cache_path:
+                self._write_cache(cache_path)
+        
+        self._resolve_price_qty_cols()
+    
+    def _read_workbook(self):
+        """Read the Column Relations, Amazon and Noon sheets from the Excel file"""
+        # Read every sheet in a single pass over the workbook
+        sheets = pd.read_excel(self.excel_file_path, sheet_name=None, **EXCEL_READ_OPTIONS)
+        self.sheet_names = list(sheets)
+        print(f"Available sheets: {self.sheet_names}")
         
         # Find and load Column Relations Sheet
         col_rel_sheet = self._find_sheet('column relations')
         if not col_rel_sheet:
             raise ValueError("Column Relations Sheet not found")
-        self.column_relations = pd.read_excel(self.excel_file, sheet_name=col_rel_sheet, header=0)
+        self.column_relations = sheets[col_rel_sheet]
         
         # Find and load Amazon sheet
         amazon_sheet = self._find_sheet('amazon')
         if not amazon_sheet:
             raise ValueError("Amazon sheet not found")
-        self.amazon_data = pd.read_excel(self.excel_file, sheet_name=amazon_sheet)
+        self.amazon_data = sheets[amazon_sheet]
         
         # Find and load Noon sheet
         noon_sheet = self._find_sheet('noon')
         if not noon_sheet:
             raise ValueError("Noon sheet not found")
-        self.noon_data = pd.read_excel(self.excel_file, sheet_name=noon_sheet)
+        self.noon_data = sheets[noon_sheet]
         
         print(f"✓ Loaded {len(self.column_relations)} mappings, {len(self.amazon_data)} Amazon rows, {len(self.noon_data)} Noon rows")
+    
+    def _resolve_price_qty_cols(self):
+        """
+        Find the price and quantity columns of each source sheet once
+        
+        Column names are lowercased a single time here; "multiply" remarks
+        read the resolved names instead of rescanning the columns. The last
+        matching column wins.
+        """
+        self.noon_price_col = self.noon_qty_col = None
+        for key_lower, key in [(str(key).lower(), key) for key in self.noon_data.columns]:
+            if 'price' in key_lower and 'vat' in key_lower:
+                self.noon_price_col = key
+            if 'quantity' in key_lower or 'qty' in key_lower:
+                self.noon_qty_col = key
+        
+        self.amazon_price_col = self.amazon_qty_col = None
+        for key_lower, key in [(str(key).lower(), key) for key in self.amazon_data.columns]:
+            if 'item price' in key_lower:
+                self.amazon_price_col = key
+            if 'quantity' in key_lower:
+                self.amazon_qty_col = key
         
     def parse_column_mapping(self):
         """Parse the column relations sheet to create mapping dictionaries"""
         # Clean column names
         self.column_relations.columns = self.column_relations.columns.str.strip()
         
-        # Find column names with flexible matching
+        # Find column names with flexible matching; names are lowercased once
+        lowered = [(col.lower(), col) for col in self.column_relations.columns]
+        
         def find_col(keywords):
-            for col in self.column_relations.columns:
-                if all(k in col.lower() for k in keywords):
-                    return col
-            return None
+            return next((col for col_lower, col in lowered if all(k in col_lower for k in keywords)), None)
         
         summary_col_name = find_col(['summary', 'column'])
         noon_col_name = find_col(['noon', 'column'])
@@ -88,233 +223,194 @@ class ReportMerger:
         noon_remarks = {}
         amazon_remarks = {}
         
-        for _, row in self.column_relations.iterrows():
-            summary_col = str(row.get(summary_col_name, '')).strip()
-            
-            # Skip if summary column is empty or NaN
-            if pd.isna(summary_col) or summary_col == '' or summary_col == 'nan':
-                continue
+        # Column positions are resolved once; rows are read as plain tuples
+        col_pos = {col: i for i, col in enumerate(self.column_relations.columns)}
+        
+        # Second Remarks column (Remarks.1) holds the Amazon remarks
+        amazon_remarks_col = next((col for col in self.column_relations.columns
+                                   if col == 'Remarks.1' or (col.startswith('Remarks') and col != 'Remarks')), None)
+        
+        def cell(row, col):
+            """Stripped text of a cell, or '' if the column is missing or the cell is empty"""
+            if col not in col_pos:
+                return ''
+            value = str(row[col_pos[col]]).strip()
+            return '' if value == 'nan' else value
+        
+        # Skip rows whose summary column is empty or NaN before looping
+        summary_names = self.column_relations[summary_col_name].astype(str).str.strip()
+        relations = self.column_relations[summary_names.notna() & summary_names.ne('') & summary_names.ne('nan')]
+        
+        for row in relations.itertuples(index=False, name=None):
+            summary_col = cell(row, summary_col_name)
             
             # Noon mapping
             if noon_col_name:
-                noon_col = str(row.get(noon_col_name, '')).strip()
-                if not pd.isna(noon_col) and noon_col != '' and noon_col != 'nan':
+                noon_col = cell(row, noon_col_name)
+                if noon_col:
                     noon_mapping[summary_col] = noon_col
                     # Get first Remarks column for Noon
-                    noon_remark = str(row.get('Remarks', '')).strip() if 'Remarks' in row.index else ''
-                    if not pd.isna(noon_remark) and noon_remark != '' and noon_remark != 'nan':
+                    noon_remark = cell(row, 'Remarks')
+                    if noon_remark:
                         noon_remarks[summary_col] = noon_remark
             
             # Amazon mapping
             if amazon_col_name:
-                amazon_col = str(row.get(amazon_col_name, '')).strip()
-                if not pd.isna(amazon_col) and amazon_col != '' and amazon_col != 'nan':
+                amazon_col = cell(row, amazon_col_name)
+                if amazon_col:
                     amazon_mapping[summary_col] = amazon_col
-                    # Get second Remarks column for Amazon (Remarks.1)
-                    amazon_remark = ''
-                    for col in self.column_relations.columns:
-                        if col == 'Remarks.1' or (col.startswith('Remarks') and col != 'Remarks'):
-                            amazon_remark = str(row.get(col, '')).strip()
-                            break
-                    if amazon_remark == '' or pd.isna(amazon_remark) or amazon_remark == 'nan':
-                        amazon_remark = str(row.get('Remarks', '')).strip() if 'Remarks' in row.index else ''
-                    if not pd.isna(amazon_remark) and amazon_remark != '' and amazon_remark != 'nan':
+                    # Get second Remarks column for Amazon, falling back to the first
+                    amazon_remark = cell(row, amazon_remarks_col) or cell(row, 'Remarks')
+                    if amazon_remark:
                         amazon_remarks[summary_col] = amazon_remark
         
-        return noon_mapping, amazon_mapping, noon_remarks, amazon_remarks
-    
-    def extract_date_component(self, date_value, component):
-        """
-        Extract day, month, or year from a date value
+        # Classify every remark once, so processing dispatches on OpKind
+        self.noon_ops = {col: self.classify_remark(remark) for col, remark in noon_remarks.items()}
+        self.amazon_ops = {col: self.classify_remark(remark) for col, remark in amazon_remarks.items()}
         
-        Args:
-            date_value: Date value (can be string, datetime, or number)
-            component: 'day', 'month', or 'year'
-        """
-        if pd.isna(date_value):
-            return None
-            
-        try:
-            # Try to parse as datetime
-            if isinstance(date_value, str):
-                dt = pd.to_datetime(date_value, errors='coerce')
-            elif isinstance(date_value, (int, float)):
-                # Excel date number
-                dt = pd.to_datetime('1899-12-30') + pd.Timedelta(days=date_value)
-            else:
-                dt = pd.to_datetime(date_value, errors='coerce')
-            
-            if pd.isna(dt):
-                return None
-                
-            if component == 'day':
-                return dt.day
-            elif component == 'month':
-                return dt.month
-            elif component == 'year':
-                return dt.year
-        except:
-            return None
+        return noon_mapping, amazon_mapping, noon_remarks, amazon_remarks
     
-    def apply_transformation(self, value, remark, source_col=None):
+    def classify_remark(self, remark):
         """
-        Apply transformation based on remarks
+        Classify a remark into the transformation it asks for
         
         Args:
-            value: Original value
             remark: Transformation instruction from remarks
-            source_col: Source column name for context
         """
-        if pd.isna(value):
-            return None
-        
         remark_lower = str(remark).lower()
         
-        # Check for "mark it NA" instruction
-        if 'mark it "na"' in remark_lower or 'mark it "na"' in remark_lower:
-            return "NA"
+        # "mark it NA" takes precedence over every other instruction
+        if 'mark it "na"' in remark_lower:
+            return OpKind.NA
         
-        # Check for date component extraction
-        if 'day number from date' in remark_lower:
-            return self.extract_date_component(value, 'day')
-        elif 'month from date' in remark_lower:
-            return self.extract_date_component(value, 'month')
-        elif 'year from date' in remark_lower:
-            return self.extract_date_component(value, 'year')
+        for phrase, op in DATE_COMPONENTS.items():
+            if phrase in remark_lower:
+                return op
         
-        # Check for multiplication (e.g., "multiply Price Including VAT with quantity")
-        if 'multiply' in remark_lower:
-            # This will be handled at row level, not single value
-            return value
+        # e.g. "multiply Price Including VAT with quantity for respective order id"
+        if 'multiply' in remark_lower and 'price' in remark_lower and 'quantity' in remark_lower:
+            return OpKind.MULTIPLY
         
-        # Check for contract/channel specific logic
         if 'if the contract is' in remark_lower or 'if sales channel is' in remark_lower:
-            # This requires row-level context, return as-is for now
-            return value
+            return OpKind.CONDITIONAL
         
-        # Default: return value as-is
-        return value
+        return OpKind.NONE
     
-    def process_noon_data(self, noon_mapping, noon_remarks):
-        """Process Noon data according to mapping and remarks"""
-        print("\nProcessing Noon data...")
+    def extract_date_component(self, values, component):
+        """
+        Extract day, month, or year from a whole column of date values
         
-        processed_rows = []
+        Args:
+            values: Series of dates (strings, datetimes, or Excel date numbers)
+            component: 'day', 'month', or 'year'
+        """
+        if pd.api.types.is_datetime64_any_dtype(values):
+            dates = values
+        elif pd.api.types.is_numeric_dtype(values):
+            dates = self._excel_serial_to_datetime(values)
+        elif values.dtype == object:
+            # Mixed column: numbers are Excel dates, everything else is parsed
+            is_number = values.map(lambda value: isinstance(value, (int, float)))
+            dates = pd.to_datetime(values.where(~is_number), errors='coerce', format='mixed')
+            dates = dates.where(~is_number, self._excel_serial_to_datetime(values.where(is_number)))
+        else:
+            dates = pd.to_datetime(values, errors='coerce', format='mixed')
+        
+        # Nullable integers keep the column numeric through the concat
+        return getattr(dates.dt, component).astype('Int64')
+    
+    def _excel_serial_to_datetime(self, values):
+        """
+        Convert Excel date numbers to datetimes (out-of-range numbers become NaT)
         
-        for _, row in tqdm(self.noon_data.iterrows(), total=len(self.noon_data), desc="Processing Noon", unit="row"):
-            processed_row = {'Source': 'Noon'}
-            
-            for summary_col, noon_col in noon_mapping.items():
-                if noon_col in row.index:
-                    value = row[noon_col]
-                    
-                    # Apply transformation if there's a remark
-                    if summary_col in noon_remarks:
-                        value = self.apply_transformation(value, noon_remarks[summary_col], noon_col)
-                    
-                    processed_row[summary_col] = value
-                else:
-                    processed_row[summary_col] = None
-            
-            # Handle special cases that need row-level context
-            processed_row = self.handle_special_cases(processed_row, row, noon_remarks, 'noon')
-            
-            processed_rows.append(processed_row)
+        Args:
+            values: Series of Excel date numbers
+        """
+        days = pd.to_numeric(values, errors='coerce')
+        days = days.where(days.abs() <= EXCEL_MAX_SERIAL)
+        return EXCEL_EPOCH + pd.to_timedelta(days, unit='D')
+    
+    def _process_source(self, data, mapping, ops, multiply_ops, source):
+        """
+        Project a source sheet onto the summary columns, column by column
         
-        print(f"✓ Processed {len(processed_rows)} Noon rows")
-        return processed_rows
+        Args:
+            data: Source DataFrame (Noon or Amazon sheet)
+            mapping: Summary column -> source column
+            ops: Summary column -> OpKind of its remark
+            multiply_ops: (summary column, price column, quantity column) list
+            source: 'Noon' or 'Amazon'
+        """
+        # Select whole columns at once; mapped columns missing from the sheet stay empty.
+        # copy=False shares the source arrays instead of copying every column
+        # into a new block. The sheet is never changed through them, because
+        # the steps below replace whole columns of out and never write in place
+        out = pd.DataFrame(
+            {summary_col: data[source_col] if source_col in data.columns else None
+             for summary_col, source_col in mapping.items()},
+            index=data.index,
+            copy=False
+        )
+        
+        # Apply transformations one column at a time
+        for summary_col, op in ops.items():
+            if mapping[summary_col] not in data.columns:
+                continue
+            if op in (OpKind.DAY, OpKind.MONTH, OpKind.YEAR):
+                # Dates are parsed once for the whole column
+                out[summary_col] = self.extract_date_component(out[summary_col], op.name.lower())
+            elif op is OpKind.NA:
+                # "mark it NA": every non-empty cell becomes the text NA
+                out[summary_col] = out[summary_col].astype(object).where(out[summary_col].isna(), "NA")
+        
+        # Price x quantity, only where both numbers are present
+        for summary_col, price_col, qty_col in multiply_ops:
+            value = pd.to_numeric(data[price_col], errors='coerce').mul(pd.to_numeric(data[qty_col], errors='coerce'))
+            out[summary_col] = value.where(value.notna(), out[summary_col])
+        
+        # Channel/contract specific rules ("if the contract is ...",
+        # "if sales channel is ...") keep the mapped value for now
+        
+        out.insert(0, 'Source', pd.Series(source, index=out.index, dtype=SOURCE_DTYPE))
+        return out
+    
+    def process_noon_data(self, noon_mapping, noon_ops, multiply_ops=()):
+        """Process Noon data according to mapping and remarks"""
+        print("\nProcessing Noon data...")
+        processed = self._process_source(self.noon_data, noon_mapping, noon_ops, multiply_ops, 'Noon')
+        print(f"✓ Processed {len(processed)} Noon rows")
+        return processed
     
-    def process_amazon_data(self, amazon_mapping, amazon_remarks):
+    def process_amazon_data(self, amazon_mapping, amazon_ops, multiply_ops=()):
         """Process Amazon data according to mapping and remarks"""
         print("\nProcessing Amazon data...")
-        
-        processed_rows = []
-        
-        for _, row in tqdm(self.amazon_data.iterrows(), total=len(self.amazon_data), desc="Processing Amazon", unit="row"):
-            processed_row = {'Source': 'Amazon'}
-            
-            for summary_col, amazon_col in amazon_mapping.items():
-                if amazon_col in row.index:
-                    value = row[amazon_col]
-                    
-                    # Apply transformation if there's a remark
-                    if summary_col in amazon_remarks:
-                        value = self.apply_transformation(value, amazon_remarks[summary_col], amazon_col)
-                    
-                    processed_row[summary_col] = value
-                else:
-                    processed_row[summary_col] = None
-            
-            # Handle special cases that need row-level context
-            processed_row = self.handle_special_cases(processed_row, row, amazon_remarks, 'amazon')
-            
-            processed_rows.append(processed_row)
-        
-        print(f"✓ Processed {len(processed_rows)} Amazon rows")
-        return processed_rows
+        processed = self._process_source(self.amazon_data, amazon_mapping, amazon_ops, multiply_ops, 'Amazon')
+        print(f"✓ Processed {len(processed)} Amazon rows")
+        return processed
     
-    def handle_special_cases(self, processed_row, original_row, remarks, source):
+    def find_multiply_ops(self, ops, price_col, qty_col):
         """
-        Handle special transformation cases that require row-level context
+        Pair every "multiply" summary column with the source price and quantity columns
         
         Args:
-            processed_row: The row being built for summary
-            original_row: Original row from source data
-            remarks: Remarks dictionary
-            source: 'noon' or 'amazon'
-        """
-        # Handle Value (Including VAT) calculation
-        # "multiply Price Including VAT with quantity for respective order id"
-        for col, remark in remarks.items():
-            remark_lower = str(remark).lower()
-            
-            if 'multiply' in remark_lower and 'price' in remark_lower and 'quantity' in remark_lower:
-                # Find price and quantity columns
-                price_col = None
-                qty_col = None
-                
-                if source == 'noon':
-                    # Look for price in original row
-                    for key in original_row.index:
-                        if 'price' in str(key).lower() and 'vat' in str(key).lower():
-                            price_col = key
-                        if 'quantity' in str(key).lower() or 'qty' in str(key).lower():
-                            qty_col = key
-                elif source == 'amazon':
-                    for key in original_row.index:
-                        if 'item price' in str(key).lower():
-                            price_col = key
-                        if 'quantity' in str(key).lower():
-                            qty_col = key
-                
-                if price_col and qty_col:
-                    try:
-                        price = pd.to_numeric(original_row[price_col], errors='coerce')
-                        qty = pd.to_numeric(original_row[qty_col], errors='coerce')
-                        if not pd.isna(price) and not pd.isna(qty):
-                            processed_row[col] = price * qty
-                    except:
-                        pass
+            ops: Summary column -> OpKind of its remark
+            price_col: Source price column (None if not found)
+            qty_col: Source quantity column (None if not found)
             
-            # Handle channel/contract specific logic
-            if 'if the contract is' in remark_lower or 'if sales channel is' in remark_lower:
-                # Extract the condition and action
-                # Example: "if the contract is MPABANC\BKLSA, & document type is Invoice then it should be backated as noon KSA"
-                if 'backated as noon ksa' in remark_lower or 'consider noon ksa' in remark_lower:
-                    # Check conditions in original row
-                    # This is a placeholder - actual implementation depends on exact column names
-                    processed_row[col] = processed_row.get(col, None)
-                elif 'consider amazon ksa' in remark_lower:
-                    processed_row[col] = processed_row.get(col, None)
-        
-        return processed_row
+        Returns:
+            List of (summary column, price column, quantity column)
+        """
+        if not (price_col and qty_col):
+            return []
+        return [(col, price_col, qty_col) for col, op in ops.items() if op is OpKind.MULTIPLY]
     
-    def merge_data(self):
-        """Merge Amazon and Noon data into summary sheet"""
-        print("\n" + "="*60)
-        print("MERGING REPORTS")
-        print("="*60)
+    def _plan_merge(self):
+        """
+        Parse the column mappings and pair multiply remarks with their columns
         
+        Returns:
+            (noon_mapping, amazon_mapping, noon_multiply, amazon_multiply, summary columns)
+        """
         # Parse column mappings
         noon_mapping, amazon_mapping, noon_remarks, amazon_remarks = self.parse_column_mapping()
         
@@ -322,55 +418,183 @@ class ReportMerger:
         print(f"  Noon columns: {len(noon_mapping)}")
         print(f"  Amazon columns: {len(amazon_mapping)}")
         
-        # Process both datasets
-        noon_processed = self.process_noon_data(noon_mapping, noon_remarks)
-        amazon_processed = self.process_amazon_data(amazon_mapping, amazon_remarks)
+        # Pair multiply remarks with the price x quantity columns
+        noon_multiply = self.find_multiply_ops(self.noon_ops, self.noon_price_col, self.noon_qty_col)
+        amazon_multiply = self.find_multiply_ops(self.amazon_ops, self.amazon_price_col, self.amazon_qty_col)
+        
+        # All summary columns in Column Relations order, Source first
+        columns = ['Source'] + list(dict.fromkeys(chain(noon_mapping, amazon_mapping)))
+        
+        return noon_mapping, amazon_mapping, noon_multiply, amazon_multiply, columns
+    
+    def merge_data(self):
+        """Merge Amazon and Noon data into summary sheet"""
+        print("\n" + "="*60)
+        print("MERGING REPORTS")
+        print("="*60)
         
-        # Combine into single DataFrame
-        all_rows = noon_processed + amazon_processed
-        self.summary_data = pd.DataFrame(all_rows)
+        noon_mapping, amazon_mapping, noon_multiply, amazon_multiply, columns = self._plan_merge()
         
-        # Get all unique columns from column relations
-        all_summary_cols = list(set(list(noon_mapping.keys()) + list(amazon_mapping.keys())))
+        # Process both datasets concurrently; they share nothing until the
+        # concat below and pandas releases the GIL in its column operations
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            noon_future = executor.submit(self.process_noon_data, noon_mapping, self.noon_ops, noon_multiply)
+            amazon_future = executor.submit(self.process_amazon_data, amazon_mapping, self.amazon_ops, amazon_multiply)
+            noon_processed = noon_future.result()
+            amazon_processed = amazon_future.result()
         
-        # Ensure all columns exist
-        for col in all_summary_cols:
-            if col not in self.summary_data.columns:
-                self.summary_data[col] = None
+        # Combine into single DataFrame; concat keeps each column's dtype
+        self.summary_data = pd.concat([noon_processed, amazon_processed], ignore_index=True)
         
-        # Add Source column at the beginning
-        cols = ['Source'] + [col for col in all_summary_cols if col in self.summary_data.columns]
-        self.summary_data = self.summary_data[cols]
+        # reindex adds any missing summary column in the same pass
+        self.summary_data = self.summary_data.reindex(columns=columns)
         
         print(f"\n✓ Merged data: {len(self.summary_data)} total rows")
         print(f"  - Noon: {len(noon_processed)} rows")
         print(f"  - Amazon: {len(amazon_processed)} rows")
         
-    def save_summary(self, output_path=None):
-        """Save the summary sheet to Excel file"""
-        if output_path is None:
-            # Create output filename based on input
-            input_path = Path(self.excel_file_path)
-            output_path = input_path.parent / f"{input_path.stem}_MERGED.xlsx"
+    def _write_sheet(self, workbook, sheet_name, data, header_format):
+        """
+        Write a DataFrame to a new worksheet, one row at a time
+        
+        In constant_memory mode xlsxwriter flushes each row once the next one
+        starts, so cells must be written in row order (DataFrame.to_excel
+        writes column by column and would lose data).
+        
+        Args:
+            workbook: Open xlsxwriter Workbook
+            sheet_name: Name of the new worksheet
+            data: DataFrame to write
+            header_format: Format for the header row
+        """
+        worksheet = workbook.add_worksheet(sheet_name)
+        worksheet.write_row(0, 0, [str(col) for col in data.columns], header_format)
+        self._write_rows(worksheet, data, 1, sheet_name)
+    
+    def _write_rows(self, worksheet, data, first_row, label):
+        """
+        Write the rows of a DataFrame to a worksheet, starting at first_row
         
+        Args:
+            worksheet: xlsxwriter Worksheet
+            data: DataFrame to write (columns in sheet order)
+            first_row: Zero-based worksheet row for the first data row
+            label: Progress bar label
+            
+        Returns:
+            The next free worksheet row
+        """
+        # The progress bar ticks once per batch of rows, not once per row
+        with tqdm(total=len(data), desc=f"Writing {label}", unit="row", mininterval=0.5) as progress:
+            for start in range(0, len(data), WRITE_BATCH_ROWS):
+                batch = data.iloc[start:start + WRITE_BATCH_ROWS]
+                for row_idx, row in enumerate(batch.itertuples(index=False, name=None), start=first_row + start):
+                    for col_idx, value in enumerate(row):
+                        # Missing values (None, NaN, NaT) are left as empty cells
+                        if not pd.isna(value):
+                            worksheet.write(row_idx, col_idx, value)
+                progress.update(len(batch))
+        
+        return first_row + len(data)
+    
+    def save_summary(self, output_path=None, include_raw=False):
+        """
+        Save the summary sheet to Excel file
+        
+        Args:
+            output_path: Output file (default: <input>_MERGED.xlsx)
+            include_raw: Also copy the Amazon, Noon and Column Relations sheets
+        """
+        output_path = self._output_path(output_path)
         print(f"\nSaving summary to: {output_path}")
         
         # Create Excel writer
-        with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
+        workbook = xlsxwriter.Workbook(str(output_path), WORKBOOK_OPTIONS)
+        header_format = workbook.add_format(HEADER_FORMAT)
+        try:
             # Write summary sheet
-            self.summary_data.to_excel(writer, sheet_name='Summary Sheet', index=False)
+            self._write_sheet(workbook, 'Summary Sheet', self.summary_data, header_format)
+            
+            # Optionally copy original sheets (they are already in the input file)
+            if include_raw:
+                self._write_raw_sheets(workbook, header_format)
+        finally:
+            workbook.close()
+        
+        print(f"✓ Summary saved successfully!")
+        print(f"  Output file: {output_path}")
+        
+        return output_path
+    
+    def merge_and_save_low_memory(self, output_path=None, include_raw=False):
+        """
+        Merge and save in stages, so only one source's summary rows exist at a time
+        
+        Noon rows are processed and written to the Summary Sheet before Amazon
+        is processed. Unless the raw sheets are copied too, each source sheet
+        is also released as soon as its rows are written.
+        
+        Args:
+            output_path: Output file (default: <input>_MERGED.xlsx)
+            include_raw: Also copy the Amazon, Noon and Column Relations sheets
+        """
+        print("\n" + "="*60)
+        print("MERGING REPORTS (LOW MEMORY)")
+        print("="*60)
+        
+        noon_mapping, amazon_mapping, noon_multiply, amazon_multiply, columns = self._plan_merge()
+        
+        output_path = self._output_path(output_path)
+        print(f"\nSaving summary to: {output_path}")
+        
+        workbook = xlsxwriter.Workbook(str(output_path), WORKBOOK_OPTIONS)
+        header_format = workbook.add_format(HEADER_FORMAT)
+        try:
+            worksheet = workbook.add_worksheet('Summary Sheet')
+            worksheet.write_row(0, 0, columns, header_format)
+            next_row = 1
+            
+            stages = (
+                ('Noon', self.process_noon_data, noon_mapping, self.noon_ops, noon_multiply),
+                ('Amazon', self.process_amazon_data, amazon_mapping, self.amazon_ops, amazon_multiply),
+            )
+            for source, process, mapping, ops, multiply_ops in stages:
+                processed = process(mapping, ops, multiply_ops).reindex(columns=columns)
+                next_row = self._write_rows(worksheet, processed, next_row, f"{source} summary rows")
+                
+                # Free this source before the next one is processed
+                del processed
+                if not include_raw:
+                    setattr(self, f"{source.lower()}_data", None)
+                gc.collect()
             
-            # Optionally copy original sheets
-            self.amazon_data.to_excel(writer, sheet_name='Amazon', index=False)
-            self.noon_data.to_excel(writer, sheet_name='Noon', index=False)
-            self.column_relations.to_excel(writer, sheet_name='Column Relations Sheet', index=False)
+            print(f"\n✓ Merged data: {next_row - 1} total rows")
+            
+            if include_raw:
+                self._write_raw_sheets(workbook, header_format)
+        finally:
+            workbook.close()
         
         print(f"✓ Summary saved successfully!")
         print(f"  Output file: {output_path}")
         
         return output_path
     
-    def run(self, output_path=None):
+    def _output_path(self, output_path):
+        """Return output_path, or <input>_MERGED.xlsx next to the input file"""
+        if output_path is None:
+            # Create output filename based on input
+            input_path = Path(self.excel_file_path)
+            output_path = input_path.parent / f"{input_path.stem}_MERGED.xlsx"
+        return output_path
+    
+    def _write_raw_sheets(self, workbook, header_format):
+        """Copy the Amazon, Noon and Column Relations sheets into the output"""
+        self._write_sheet(workbook, 'Amazon', self.amazon_data, header_format)
+        self._write_sheet(workbook, 'Noon', self.noon_data, header_format)
+        self._write_sheet(workbook, 'Column Relations Sheet', self.column_relations, header_format)
+    
+    def run(self, output_path=None, include_raw=False, low_memory=False):
         """Run the complete merge process"""
         print("\n" + "="*60)
         print("AMAZON & NOON REPORT MERGER")
@@ -380,11 +604,15 @@ class ReportMerger:
         # Load sheets
         self.load_sheets()
         
-        # Merge data
-        self.merge_data()
-        
-        # Save summary
-        output_file = self.save_summary(output_path)
+        if low_memory:
+            # Merge and save one source at a time
+            output_file = self.merge_and_save_low_memory(output_path, include_raw)
+        else:
+            # Merge data
+            self.merge_data()
+            
+            # Save summary
+            output_file = self.save_summary(output_path, include_raw)
         
         print("\n" + "="*60)
         print("MERGE COMPLETE!")
@@ -393,11 +621,29 @@ class ReportMerger:
         return output_file
 
 
+def parse_args():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="Merge Amazon and Noon reports based on the Column Relations Sheet")
+    parser.add_argument('excel_file', nargs='?',
+                        help="Excel file with all sheets (default: first .xlsx file in the current folder)")
+    parser.add_argument('output_path', nargs='?',
+                        help="Output file (default: <input>_MERGED.xlsx)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help=f"Always re-read the Excel file instead of using sheets cached in {CACHE_DIR}")
+    parser.add_argument('--include-raw', action='store_true',
+                        help="Also copy the Amazon, Noon and Column Relations sheets into the output")
+    parser.add_argument('--low-memory', action='store_true',
+                        help="Process and write Noon and Amazon one after another to lower peak memory")
+    return parser.parse_args()
+
+
 def main():
     """Main function to run the report merger"""
+    args = parse_args()
+    
     # Get Excel file path from command line or auto-detect
-    if len(sys.argv) > 1:
-        excel_file = sys.argv[1]
+    if args.excel_file:
+        excel_file = args.excel_file
     else:
         excel_files = glob.glob("*.xlsx")
         if not excel_files:
@@ -406,8 +652,7 @@ def main():
         excel_file = excel_files[0]
         print(f"Using: {excel_file}")
     
-    output_path = sys.argv[2] if len(sys.argv) > 2 else None
-    ReportMerger(excel_file).run(output_path)
+    ReportMerger(excel_file, use_cache=not args.no_cache).run(args.output_path, include_raw=args.include_raw, low_memory=args.low_memory)
 
 
 if __name__ == "__main__":
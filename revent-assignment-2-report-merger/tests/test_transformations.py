@@ -0,0 +1,179 @@
+"""
+Regression tests: the column-wise transformations must match the original
+row-by-row implementation (kept below as the reference)
+"""
+
+from datetime import datetime
+import numpy as np
+import pandas as pd
+import pytest
+from report_merger import ReportMerger, OpKind
+
+
+# The reference parses day-first strings one at a time and warns about it
+pytestmark = pytest.mark.filterwarnings('ignore:Parsing dates:UserWarning')
+
+
+# Reference implementation: the original per-row logic
+def reference_extract_date_component(date_value, component):
+    """Extract day, month, or year from a single date value"""
+    if pd.isna(date_value):
+        return None
+        
+    try:
+        # Try to parse as datetime
+        if isinstance(date_value, str):
+            dt = pd.to_datetime(date_value, errors='coerce')
+        elif isinstance(date_value, (int, float)):
+            # Excel date number
+            dt = pd.to_datetime('1899-12-30') + pd.Timedelta(days=date_value)
+        else:
+            dt = pd.to_datetime(date_value, errors='coerce')
+        
+        if pd.isna(dt):
+            return None
+            
+        if component == 'day':
+            return dt.day
+        elif component == 'month':
+            return dt.month
+        elif component == 'year':
+            return dt.year
+    except:
+        return None
+
+
+def reference_apply_transformation(value, remark):
+    """Apply the transformation a remark asks for to a single value"""
+    if pd.isna(value):
+        return None
+    
+    remark_lower = str(remark).lower()
+    
+    if 'mark it "na"' in remark_lower:
+        return "NA"
+    
+    if 'day number from date' in remark_lower:
+        return reference_extract_date_component(value, 'day')
+    elif 'month from date' in remark_lower:
+        return reference_extract_date_component(value, 'month')
+    elif 'year from date' in remark_lower:
+        return reference_extract_date_component(value, 'year')
+    
+    return value
+
+
+def normalize(value):
+    """Compare missing values and numbers the same way across dtypes"""
+    if value is None or value is pd.NA or (isinstance(value, float) and np.isnan(value)) or value is pd.NaT:
+        return None
+    if isinstance(value, (np.integer, np.floating)):
+        return value.item()
+    return value
+
+
+REMARKS = [
+    '',
+    np.nan,
+    None,
+    'Mark it "NA"',
+    'MARK IT "NA" for all rows',
+    'Get Day Number From Date',
+    'month from date',
+    'YEAR FROM DATE',
+    'Multiply Price Including VAT with Quantity for respective order id',
+    'If the contract is MPABANC, consider noon KSA',
+    'copy as is',
+    'Mark it "NA" instead of the day number from date',
+]
+
+MIXED_DATES = [
+    '2024-01-15',
+    '15/03/2023',
+    datetime(2022, 12, 31, 23, 59),
+    45000,
+    45000.75,
+    'not a date',
+    '',
+    None,
+    np.nan,
+]
+
+
+@pytest.fixture
+def merger():
+    return ReportMerger('unused.xlsx', use_cache=False)
+
+
+@pytest.mark.parametrize('remark', REMARKS)
+def test_classify_remark(merger, remark):
+    op = merger.classify_remark(remark)
+    remark_lower = str(remark).lower()
+    if 'mark it "na"' in remark_lower:
+        assert op is OpKind.NA
+    elif 'from date' in remark_lower:
+        assert op in (OpKind.DAY, OpKind.MONTH, OpKind.YEAR)
+    elif 'multiply' in remark_lower:
+        assert op is OpKind.MULTIPLY
+    elif 'if the contract is' in remark_lower:
+        assert op is OpKind.CONDITIONAL
+    else:
+        assert op is OpKind.NONE
+
+
+@pytest.mark.parametrize('column', [
+    pd.Series(MIXED_DATES, dtype=object),
+    pd.Series(['2024-01-15', '2023-07-04', 'bad', None], dtype=object),
+    pd.Series(['2024-01-15', '2023-07-04', 'bad', None], dtype='str'),
+    pd.Series([45000, 45123.5, np.nan, 1]),
+    pd.Series(pd.to_datetime(['2024-01-15', None, '2020-02-29'])),
+    pd.Series([None, None], dtype=object),
+], ids=['mixed', 'strings', 'str-dtype', 'serials', 'datetimes', 'blank'])
+@pytest.mark.parametrize('component', ['day', 'month', 'year'])
+def test_extract_date_component_matches_reference(merger, column, component):
+    result = merger.extract_date_component(column, component)
+    expected = [reference_extract_date_component(value, component) for value in column]
+    assert [normalize(value) for value in result] == expected
+
+
+def test_process_source_matches_reference(merger):
+    data = pd.DataFrame({
+        'Date': pd.Series(MIXED_DATES, dtype=object),
+        'Status': ['Shipped', '', None, 'Returned', np.nan, 'x', 'y', 'z', 'NA'],
+        'Price': [10, 12.5, None, '7', 'n/a', 3, 0, 1, 2],
+        'Qty': [2, 1, 4, None, 1, '3', 5, 1, 1],
+        'Order': [f'ORD-{idx}' for idx in range(9)],
+    })
+    # Summary column -> (source column, remark)
+    columns = {
+        'Day': ('Date', REMARKS[5]),
+        'Month': ('Date', REMARKS[6]),
+        'Year': ('Date', REMARKS[7]),
+        'Status': ('Status', REMARKS[3]),
+        'Status Upper': ('Status', REMARKS[4]),
+        'Value': ('Price', REMARKS[8]),
+        'Channel': ('Order', REMARKS[9]),
+        'Order': ('Order', REMARKS[0]),
+        'Order Copy': ('Order', REMARKS[1]),
+        'Missing': ('Not In Sheet', REMARKS[10]),
+    }
+    mapping = {summary: source for summary, (source, _) in columns.items()}
+    ops = {summary: merger.classify_remark(remark) for summary, (_, remark) in columns.items()}
+    multiply_ops = merger.find_multiply_ops(ops, 'Price', 'Qty')
+    
+    out = merger._process_source(data, mapping, ops, multiply_ops, 'Noon')
+    
+    assert list(out.columns) == ['Source'] + list(columns)
+    assert (out['Source'] == 'Noon').all()
+    for idx, row in data.iterrows():
+        for summary, (source, remark) in columns.items():
+            if source not in data.columns:
+                expected = None
+            else:
+                expected = reference_apply_transformation(row[source], remark)
+            if ops[summary] is OpKind.MULTIPLY:
+                price = pd.to_numeric(row['Price'], errors='coerce')
+                qty = pd.to_numeric(row['Qty'], errors='coerce')
+                if not pd.isna(price) and not pd.isna(qty):
+                    expected = price * qty
+            assert normalize(out.at[idx, summary]) == normalize(expected), (summary, idx)